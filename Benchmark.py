@@ -0,0 +1,255 @@
+""" Non interactive throughput benchmark of the search algorithm
+
+Runs SearchAlgorithmIterative.find_all_solutions for every combination of domain, frontier
+mode and visited mode for a fixed budget of visited nodes, each one in its own process, and
+writes one JSON object per line with the nodes per second, the time to the first solution, the
+frontier high water mark and the peak memory. A case that fails gets a line with its error.
+With --compare the nodes per second are compared with a previous output, for example
+one written before a change:
+
+    python Benchmark.py --output before.jsonl
+    python Benchmark.py --output after.jsonl --compare before.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import queue
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Tuple, Container, Type, Union
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from SearchAlgorithm.Structures import State, FoundSolution, GoalSet, GoalPredicate
+from SearchAlgorithm.FrontierMode import (FrontierMode, FrontierModeDFS, FrontierModeDFSLazy,
+                                          FrontierModeDFSIndexed, FrontierModeBFS, FrontierModeBFSIndexed,
+                                          FrontierModeAStar)
+from SearchAlgorithm.VisitedMode import VisitedMode, VisitedModeNone, VisitedModeSet, VisitedModeBloom
+from SearchAlgorithm.GenerateNeighbors import GenerateNeighbors
+from SearchAlgorithm.DebugMode import DebugMode
+from SearchAlgorithm.SearchAlgorithm import SearchAlgorithmIterative
+import Senku
+import SlidingPuzzle
+import Maze
+
+# The frontiers without an index look for repeated states with a linear scan, so they are only run
+# without visited states
+MODES: Tuple[Tuple[Type[FrontierMode], Type[VisitedMode]], ...] = (
+    (FrontierModeDFS, VisitedModeNone),
+    (FrontierModeDFSLazy, VisitedModeNone),
+    (FrontierModeDFSIndexed, VisitedModeSet),
+    (FrontierModeDFSIndexed, VisitedModeBloom),
+    (FrontierModeBFS, VisitedModeNone),
+    (FrontierModeBFSIndexed, VisitedModeSet),
+    (FrontierModeAStar, VisitedModeNone),
+    (FrontierModeAStar, VisitedModeSet),
+)
+Problem = Tuple[State, Container[State], Type[GenerateNeighbors]]
+
+
+def english_senku(arguments) -> Problem:
+    board = Senku.ENGLISH_BOARD
+    pegs = ((1 << len(board.holes)) - 1) ^ board.bits[(3, 3)]
+    return Senku.SenkuBitboardState(pegs), GoalSet([Senku.SenkuBitboardState(board.bits[(3, 3)])]), \
+        Senku.GenerateNeighborsSenkuBitboard
+
+
+def english_senku_array(arguments) -> Problem:
+    initial_state, goal_states, _ = english_senku(arguments)
+    goal_state, = goal_states
+    return initial_state.to_senku_state(0), GoalSet([goal_state.to_senku_state(31)]), \
+        Senku.GenerateNeighborsSenku
+
+
+def european_senku(arguments) -> Problem:
+    board = Senku.EUROPEAN_BOARD
+    pegs = ((1 << len(board.holes)) - 1) ^ board.bits[(0, 3)]
+    return Senku.EuropeanSenkuBitboardState(pegs), \
+        GoalPredicate(Senku.is_single_peg), \
+        Senku.GenerateNeighborsEuropeanSenkuBitboard
+
+
+def triangular_senku(arguments) -> Problem:
+    board = Senku.TRIANGULAR_BOARD
+    pegs = ((1 << len(board.holes)) - 1) ^ board.bits[(0, 0)]
+    return Senku.TriangularSenkuBitboardState(pegs), \
+        GoalPredicate(Senku.is_single_peg), \
+        Senku.GenerateNeighborsTriangularSenkuBitboard
+
+
+def sliding_puzzle(arguments) -> Problem:
+    return SlidingPuzzle.scrambled_state(arguments.puzzle_size, arguments.puzzle_moves), \
+        GoalSet([SlidingPuzzle.solved_state(arguments.puzzle_size)]), \
+        SlidingPuzzle.GenerateNeighborsSlidingPuzzle
+
+
+def maze(arguments) -> Problem:
+    grid = Maze.Maze(arguments.maze_size)
+    return Maze.MazeState(grid, grid.start), GoalSet([Maze.MazeState(grid, grid.goal)]), \
+        Maze.GenerateNeighborsMaze
+
+
+DOMAINS: Dict[str, Callable[[argparse.Namespace], Problem]] = {
+    'english_senku': english_senku,
+    'english_senku_array': english_senku_array,
+    'european_senku': european_senku,
+    'triangular_senku': triangular_senku,
+    'sliding_puzzle': sliding_puzzle,
+    'maze': maze,
+}
+
+
+class BudgetDebugMode(DebugMode):
+    """ Silent debug mode that stops the search after node_budget visited nodes and keeps the
+    time of the first solution
+    """
+    def __init__(self, node_budget: int):
+        super().__init__(False, False, False, False, False, False, 0, read_exit_key=False)
+        self.node_budget = node_budget
+        self.time_first_solution = None
+
+    def after_iteration(self, frontier_size, partial_solution):
+        super().after_iteration(frontier_size, partial_solution)
+        if partial_solution.found_solution == FoundSolution.YES and self.time_first_solution is None:
+            self.time_first_solution = time.perf_counter() - self.t0_actual_runtime
+        if self.amount_nodes_visited >= self.node_budget:
+            self.cancel_token.cancel()
+
+    def _show_debug(self):
+        pass
+
+
+def run_case(
+        arguments: argparse.Namespace,
+        domain: str,
+        frontier_mode: Type[FrontierMode],
+        visited_mode: Type[VisitedMode],
+        results: multiprocessing.Queue
+):
+    initial_state, goal_states, generate_neighbors = DOMAINS[domain](arguments)
+    filters = []
+    if issubclass(visited_mode, VisitedModeBloom):
+        class RecordedVisitedMode(visited_mode):
+            # Keeps the filter of the search to report how full it ended
+            @classmethod
+            def create_visited(cls):
+                filters.append(super().create_visited())
+                return filters[-1]
+        search_visited_mode = RecordedVisitedMode
+    else:
+        search_visited_mode = visited_mode
+    debug_mode = BudgetDebugMode(arguments.node_budget)
+    t0 = time.perf_counter()
+    amount_solutions = SearchAlgorithmIterative.find_all_solutions(
+        frontier_mode, search_visited_mode, generate_neighbors, debug_mode,
+        visited_mode is not VisitedModeNone, initial_state, goal_states)
+    runtime = time.perf_counter() - t0
+    result = {
+        'domain': domain,
+        'frontier_mode': frontier_mode.__name__,
+        'visited_mode': visited_mode.__name__,
+        'node_budget': arguments.node_budget,
+        'nodes_visited': debug_mode.amount_nodes_visited,
+        'solutions': amount_solutions,
+        'runtime': runtime,
+        'nodes_per_second': debug_mode.amount_nodes_visited / runtime if runtime else None,
+        'time_first_solution': debug_mode.time_first_solution,
+        'frontier_max_size': debug_mode.max_size_frontier,
+        # ru_maxrss is in kilobytes on Linux
+        'max_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 if resource else None,
+    }
+    if filters:
+        result['expected_false_positive_rate'] = visited_mode.expected_false_positive_rate(filters[-1])
+    results.put(result)
+
+
+def wait_result(process: multiprocessing.Process, results: multiprocessing.Queue) -> Union[dict, None]:
+    """ The result of the process of a case, None if it ended without one, like after an exception """
+    while True:
+        try:
+            return results.get(timeout=1)
+        except queue.Empty:
+            if not process.is_alive():
+                # It may have put the result just before ending
+                try:
+                    return results.get(timeout=1)
+                except queue.Empty:
+                    return None
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, previous_path: str):
+    with open(previous_path) as file:
+        previous = {(result['domain'], result['frontier_mode'], result['visited_mode']): result
+                    for result in map(json.loads, file)}
+    for result in results:
+        old_result = previous.get((result['domain'], result['frontier_mode'], result['visited_mode']))
+        if old_result and old_result['nodes_per_second'] and result['nodes_per_second']:
+            print('{:<20} {:<24} {:<16} {:>10.0f} -> {:>10.0f} nodes/sec ({:+.1%})'.format(
+                result['domain'], result['frontier_mode'], result['visited_mode'],
+                old_result['nodes_per_second'], result['nodes_per_second'],
+                result['nodes_per_second'] / old_result['nodes_per_second'] - 1), file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--domains', nargs='+', choices=sorted(DOMAINS), default=sorted(DOMAINS))
+    frontier_modes = sorted({frontier_mode.__name__ for frontier_mode, _ in MODES})
+    visited_modes = sorted({visited_mode.__name__ for _, visited_mode in MODES})
+    parser.add_argument('--frontier-modes', nargs='+', choices=frontier_modes, default=frontier_modes)
+    parser.add_argument('--visited-modes', nargs='+', choices=visited_modes, default=visited_modes)
+    parser.add_argument('--node-budget', type=int, default=20000)
+    parser.add_argument('--puzzle-size', type=int, default=3, help='3 for the 8-puzzle, 4 for the 15-puzzle')
+    parser.add_argument('--puzzle-moves', type=int, default=40, help='random moves to scramble the puzzle')
+    parser.add_argument('--maze-size', type=int, default=50, help='rooms per side of the maze')
+    parser.add_argument('--output', help='file for the JSON lines, stdout by default')
+    parser.add_argument('--compare', help='previous output to compare the nodes per second with')
+    arguments = parser.parse_args()
+
+    commit = git_commit()
+    results = []
+    output = open(arguments.output, 'w') if arguments.output else sys.stdout
+    for domain in arguments.domains:
+        for frontier_mode, visited_mode in MODES:
+            if frontier_mode.__name__ not in arguments.frontier_modes or \
+                    visited_mode.__name__ not in arguments.visited_modes:
+                continue
+            # A process per case, so the peak memory is only the one of the case
+            results_queue = multiprocessing.Queue()
+            process = multiprocessing.Process(
+                target=run_case, args=(arguments, domain, frontier_mode, visited_mode, results_queue))
+            process.start()
+            result = wait_result(process, results_queue)
+            process.join()
+            if result is None:
+                result = {
+                    'domain': domain,
+                    'frontier_mode': frontier_mode.__name__,
+                    'visited_mode': visited_mode.__name__,
+                    'node_budget': arguments.node_budget,
+                    'nodes_per_second': None,
+                    'error': 'the case process ended with exit code {}'.format(process.exitcode),
+                }
+            result['commit'] = commit
+            results.append(result)
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+    if arguments.output:
+        output.close()
+    if arguments.compare:
+        compare(results, arguments.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+import random
+from typing import Container, List, Tuple, Iterator
+
+from SearchAlgorithm.Structures import State, Node
+from SearchAlgorithm.FrontierMode import FrontierModeAStar
+from SearchAlgorithm.VisitedMode import VisitedModeSet
+from SearchAlgorithm.GenerateNeighbors import GenerateNeighbors
+from SearchAlgorithm.SearchAlgorithm import SearchAlgorithmIterative
+
+# (row step, column step) for each move code
+MOVES = ((-1, 0), (1, 0), (0, -1), (0, 1))
+MOVE_NAMES = ('up', 'down', 'left', 'right')
+
+
+class Maze:
+    """ Perfect maze of size x size rooms carved with a randomized depth first search
+
+    The grid has (2 * size + 1) x (2 * size + 1) cells, the rooms are in the odd rows and
+    columns and the rest are walls or the passages between rooms
+    """
+    def __init__(self, size: int, seed: int = 0):
+        self.width = 2 * size + 1
+        self.open_cells = [[False] * self.width for _ in range(self.width)]
+        random_generator = random.Random(seed)
+        self.open_cells[1][1] = True
+        stack = [(1, 1)]
+        while stack:
+            row, column = stack[-1]
+            next_rooms = [(row + 2 * row_step, column + 2 * column_step, row_step, column_step)
+                          for row_step, column_step in MOVES
+                          if 0 < row + 2 * row_step < self.width and 0 < column + 2 * column_step < self.width
+                          and not self.open_cells[row + 2 * row_step][column + 2 * column_step]]
+            if next_rooms:
+                next_row, next_column, row_step, column_step = random_generator.choice(next_rooms)
+                self.open_cells[row + row_step][column + column_step] = True
+                self.open_cells[next_row][next_column] = True
+                stack.append((next_row, next_column))
+            else:
+                stack.pop()
+        self.start = (1, 1)
+        self.goal = (self.width - 2, self.width - 2)
+
+    def __str__(self):
+        return '\n'.join(''.join(' ' if cell else '#' for cell in row) for row in self.open_cells)
+
+
+class MazeState(State):
+    __slots__ = ('maze', 'position')
+
+    def __init__(self, maze: Maze, position: Tuple[int, int]):
+        self.maze = maze
+        self.position = position
+
+    def __eq__(self, other):
+        return self.position == other.position
+
+    def key(self):
+        return self.position
+
+    def __hash__(self):
+        return hash(self.position)
+
+    def heuristic(self):
+        return abs(self.position[0] - self.maze.goal[0]) + abs(self.position[1] - self.maze.goal[1])
+
+
+class GenerateNeighborsMaze(GenerateNeighbors):
+    @staticmethod
+    def generate_neighbors(
+            actual_node: Node[MazeState],
+            frontier: Container[Node[MazeState]],
+            visited_states: Container[MazeState]
+    ) -> List[Node[MazeState]]:
+        return list(GenerateNeighborsMaze.iterate_neighbors(actual_node, frontier, visited_states))
+
+    @staticmethod
+    def iterate_neighbors(
+            actual_node: Node[MazeState],
+            frontier: Container[Node[MazeState]],
+            visited_states: Container[MazeState]
+    ) -> Iterator[Node[MazeState]]:
+        maze = actual_node.state.maze
+        row, column = actual_node.state.position
+        for move, (row_step, column_step) in enumerate(MOVES):
+            if maze.open_cells[row + row_step][column + column_step]:
+                yield Node(MazeState(maze, (row + row_step, column + column_step)), actual_node, move,
+                           actual_node.cost + 1)
+
+    @staticmethod
+    def generate_predecessors(
+            actual_node: Node[MazeState],
+            frontier: Container[Node[MazeState]],
+            visited_states: Container[MazeState]
+    ) -> List[Node[MazeState]]:
+        # Every move is undone by the opposite one, which is the other move of its pair in MOVES
+        neighbors = GenerateNeighborsMaze.iterate_neighbors(actual_node, frontier, visited_states)
+        return [Node(neighbor.state, actual_node, neighbor.move ^ 1, neighbor.cost) for neighbor in neighbors]
+
+    @staticmethod
+    def describe_move(move: int) -> str:
+        return MOVE_NAMES[move]
+
+
+def main():
+    maze = Maze(20)
+    print(maze)
+    solution = SearchAlgorithmIterative.find_solution(
+        frontier_mode=FrontierModeAStar,
+        visited_mode=VisitedModeSet,
+        generate_neighbors=GenerateNeighborsMaze,
+        frontier_remove_repeated=False,
+        initial_state=MazeState(maze, maze.start),
+        goal_states=[MazeState(maze, maze.goal)]
+    )
+    print(solution)
+
+
+if __name__ == '__main__':
+    main()
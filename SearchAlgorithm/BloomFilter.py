@@ -0,0 +1,92 @@
+import math
+import mmap
+import os
+import weakref
+from typing import Hashable, Tuple
+
+
+class BloomFilter:
+    """ Set of keys in a fixed amount of memory that can wrongly say that a key is in it, but never
+    that a key is not
+
+    The bits are sized for capacity keys with a false_positive_rate probability of a wrong answer,
+    or given by size_bytes. They are in a bytearray, or in the file path through mmap, which starts
+    zeroed unless resume is set and the file already has the size. Resuming a file in another
+    process only works if the hashes of the keys do not change between processes, like the ones
+    of ints or tuples of ints (the ones of str and bytes do unless PYTHONHASHSEED is set). The file
+    is closed by close or when the filter is garbage collected
+    """
+    def __init__(self, capacity: int, false_positive_rate: float, size_bytes: int = None, path: str = None,
+                 resume: bool = False):
+        if size_bytes is None:
+            size_bytes = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2 / 8)
+        self.amount_bits = size_bytes * 8
+        self.amount_hashes = max(1, round(self.amount_bits / capacity * math.log(2)))
+        self.bits_set = 0
+        self.file = None
+        if path is None:
+            self.bits = bytearray(size_bytes)
+        else:
+            reused = resume and os.path.isfile(path) and os.path.getsize(path) == size_bytes
+            self.file = open(path, 'r+b' if reused else 'w+b')
+            if not reused:
+                self.file.truncate(size_bytes)
+            self.bits = mmap.mmap(self.file.fileno(), size_bytes)
+            self._finalizer = weakref.finalize(self, _close_all, self.bits, self.file)
+            if reused:
+                for start in range(0, size_bytes, 1 << 20):
+                    chunk = self.bits[start:start + (1 << 20)]
+                    self.bits_set += bin(int.from_bytes(chunk, 'little')).count('1')
+
+    @staticmethod
+    def _hashes(key: Hashable) -> Tuple[int, int]:
+        """ Two hashes of the key, bit i of the key is at h1 + i * h2 (double hashing) """
+        # splitmix64 of the hash, the ones of small ints are the ints themselves
+        mixed = hash(key) & 0xFFFFFFFFFFFFFFFF
+        mixed = (mixed ^ (mixed >> 30)) * 0xBF58476D1CE4E5B9 & 0xFFFFFFFFFFFFFFFF
+        mixed = (mixed ^ (mixed >> 27)) * 0x94D049BB133111EB & 0xFFFFFFFFFFFFFFFF
+        mixed ^= mixed >> 31
+        return mixed & 0xFFFFFFFF, mixed >> 32 | 1
+
+    def add(self, key: Hashable):
+        bits = self.bits
+        amount_bits = self.amount_bits
+        position, step = self._hashes(key)
+        for _ in range(self.amount_hashes):
+            position %= amount_bits
+            mask = 1 << (position & 7)
+            byte = bits[position >> 3]
+            if not byte & mask:
+                bits[position >> 3] = byte | mask
+                self.bits_set += 1
+            position += step
+
+    def __contains__(self, key) -> bool:
+        bits = self.bits
+        amount_bits = self.amount_bits
+        position, step = self._hashes(key)
+        for _ in range(self.amount_hashes):
+            position %= amount_bits
+            if not bits[position >> 3] >> (position & 7) & 1:
+                return False
+            position += step
+        return True
+
+    def expected_false_positive_rate(self) -> float:
+        """ Probability that a key never added is said to be in the filter, with the bits set now """
+        return (self.bits_set / self.amount_bits) ** self.amount_hashes
+
+    def close(self):
+        if self.file is not None:
+            self._finalizer()
+
+    def __enter__(self) -> 'BloomFilter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _close_all(*resources):
+    for resource in resources:
+        resource.close()
@@ -0,0 +1,20 @@
+import signal
+import threading
+from typing import Iterable
+
+
+class CancelToken:
+    """ Flag to stop a search from another thread or from a signal handler """
+    def __init__(self):
+        self.event = threading.Event()
+
+    def cancel(self):
+        self.event.set()
+
+    def is_cancelled(self) -> bool:
+        return self.event.is_set()
+
+    def cancel_on_signals(self, signals: Iterable[int] = (signal.SIGINT, signal.SIGTERM)):
+        """ Cancel when the process receives any of signals, it must be called from the main thread """
+        for signal_number in signals:
+            signal.signal(signal_number, lambda signal_number, frame: self.cancel())
@@ -0,0 +1,109 @@
+""" Compact binary checkpoints of a search
+
+File layout, little endian:
+    header: magic, version, amount of solutions, amount of nodes visited, max size of the
+        frontier, total runtime, amount of nodes, amount of frontier nodes
+    nodes: parent index (-1 for none), move code, cost, flags, length of the state and the
+        State.pack of the state. Parents are written before their children, each node once
+    frontier: index of each frontier node, in FrontierMode.dump_frontier order
+
+The frontier nodes and all their ancestors are written, the ancestors shared by many nodes
+only once. The move codes must be ints. The file is written to a temporary file and then
+renamed, so a crash while saving keeps the previous checkpoint
+"""
+import os
+import struct
+from typing import List, Dict, NamedTuple, Type
+
+from .Structures import Node, State
+
+MAGIC = b'SPAC'
+VERSION = 1
+_HEADER = struct.Struct('<4sBQQQdQQ')
+_NODE = struct.Struct('<qqqBI')
+_INDEX = struct.Struct('<Q')
+_HAS_MOVE = 1
+
+
+class Checkpoint(NamedTuple):
+    amount_solutions: int
+    amount_nodes_visited: int
+    max_size_frontier: int
+    total_runtime: float
+    frontier_nodes: List[Node]
+
+
+def is_checkpoint(path: str) -> bool:
+    with open(path, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    indexes: Dict[int, int] = {}
+    records = []
+    frontier_indexes = []
+    for frontier_node in checkpoint.frontier_nodes:
+        # Ancestors without index, from the node up, are written root first
+        new_nodes = []
+        node = frontier_node
+        while node is not None and id(node) not in indexes:
+            new_nodes.append(node)
+            node = node.parent
+        for node in reversed(new_nodes):
+            indexes[id(node)] = len(indexes)
+            records.append(_pack_node(node, indexes))
+        frontier_indexes.append(indexes[id(frontier_node)])
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(_HEADER.pack(
+            MAGIC, VERSION, checkpoint.amount_solutions, checkpoint.amount_nodes_visited,
+            checkpoint.max_size_frontier, checkpoint.total_runtime, len(records), len(frontier_indexes)))
+        file.write(b''.join(records))
+        file.write(b''.join(_INDEX.pack(index) for index in frontier_indexes))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path: str, state_type: Type[State]) -> Checkpoint:
+    """ Raise ValueError if the file is not a checkpoint of this version or is truncated """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if len(data) < _HEADER.size or data[:len(MAGIC)] != MAGIC:
+        raise ValueError('{} is not a version {} checkpoint'.format(path, VERSION))
+    (magic, version, amount_solutions, amount_nodes_visited, max_size_frontier, total_runtime,
+     amount_nodes, amount_frontier) = _HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError('{} is not a version {} checkpoint'.format(path, VERSION))
+    offset = _HEADER.size
+    nodes: List[Node] = []
+    for _ in range(amount_nodes):
+        if offset + _NODE.size > len(data):
+            raise ValueError('{} is truncated'.format(path))
+        parent_index, move, cost, flags, state_length = _NODE.unpack_from(data, offset)
+        offset += _NODE.size
+        state = state_type.unpack(data[offset:offset + state_length])
+        offset += state_length
+        nodes.append(Node(
+            state,
+            nodes[parent_index] if parent_index >= 0 else None,
+            move if flags & _HAS_MOVE else None,
+            cost))
+    if offset + amount_frontier * _INDEX.size != len(data):
+        raise ValueError('{} is truncated'.format(path))
+    frontier_indexes = _INDEX.iter_unpack(data[offset:])
+    frontier_nodes = [nodes[index] for (index,) in frontier_indexes]
+    return Checkpoint(amount_solutions, amount_nodes_visited, max_size_frontier, total_runtime,
+                      frontier_nodes)
+
+
+def _pack_node(node: Node, indexes: Dict[int, int]) -> bytes:
+    if node.move is not None and not isinstance(node.move, int):
+        raise TypeError('checkpoints need int move codes, got {!r}'.format(node.move))
+    state = node.state.pack()
+    return _NODE.pack(
+        indexes[id(node.parent)] if node.parent is not None else -1,
+        node.move if node.move is not None else 0,
+        node.cost,
+        _HAS_MOVE if node.move is not None else 0,
+        len(state)) + state
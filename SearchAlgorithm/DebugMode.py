@@ -1,14 +1,14 @@
 import os
-import pickle
 import threading
 
 import time
 from typing import Type, Collection
 
 from .Structures import Node, State, FoundSolution
+from .CancelToken import CancelToken
 from .FrontierMode import FrontierMode
-
-STOP = False
+from .Checkpoint import Checkpoint, is_checkpoint, save_checkpoint, load_checkpoint
+from .Metrics import SearchMetrics
 
 
 class DebugMode:
@@ -25,8 +25,17 @@ class DebugMode:
             show_every_x_solutions: int = 0,
             show_every_x_nodes_visited: int = 0,
             show_every_x_secs: int = 0,
-            save_file_path: str = None
+            save_file_path: str = None,
+            checkpoint_every_x_secs: int = 0,
+            checkpoint_every_x_nodes_visited: int = 0,
+            metrics: SearchMetrics = None,
+            cancel_token: CancelToken = None,
+            read_exit_key: bool = True
     ):
+        """ :param cancel_token: stops the search when cancelled
+        :param read_exit_key: stop the search when 'a' is entered in stdin, False to run without
+            a terminal, like in a service or in tests
+        """
         self.show_amount_solutions = show_amount_solutions
         self.show_amount_nodes_visited = show_amount_nodes_visited
         self.show_max_size_frontier = show_max_size_frontier
@@ -40,6 +49,8 @@ class DebugMode:
         self.thousand_separator = thousand_separator
         self.show_every_x_solutions = show_every_x_solutions
         self.show_every_x_nodes_visited = show_every_x_nodes_visited
+        self.cancel_token = cancel_token if cancel_token is not None else CancelToken()
+        self.finished = threading.Event()
         self.thread_show = None
         if show_every_x_secs != 0:
             self.thread_show = threading.Thread(
@@ -47,25 +58,45 @@ class DebugMode:
                 args=(show_every_x_secs,))
             self.thread_show.start()
         self.save_file_path = save_file_path
+        self.checkpoint_every_x_secs = checkpoint_every_x_secs
+        self.checkpoint_every_x_nodes_visited = checkpoint_every_x_nodes_visited
+        self.next_checkpoint_time = 0
+        self.next_checkpoint_nodes_visited = 0
+        self.frontier_mode = None
+        self.metrics = metrics
         self.amount_solutions = 0
         self.max_size_frontier = 0
         self.amount_nodes_visited = 0
         self.t0_actual_runtime = 0
         self.t0_total_runtime = 0
-        self.thread_quit = threading.Thread(target=self._quit_program)
-        self.thread_quit.start()
+        self.thread_quit = None
+        if read_exit_key:
+            # Daemon, so a search that finished does not wait for a key
+            self.thread_quit = threading.Thread(target=self._quit_program, daemon=True)
+            self.thread_quit.start()
 
     def initialization(self, initial_state: State, frontier_mode: Type[FrontierMode])\
             -> Collection[Node]:
-        if os.path.isfile(self.save_file_path):
-            (self.amount_solutions, self.amount_nodes_visited, frontier,
-             self.max_size_frontier, self.t0_total_runtime) = \
-                pickle.load(open(self.save_file_path, "rb"))
+        self.frontier_mode = frontier_mode
+        if self.save_file_path:
+            frontier_mode.check_can_save()
+        if self.save_file_path and os.path.isfile(self.save_file_path):
+            if not is_checkpoint(self.save_file_path):
+                # The pickles of the versions without checkpoints have nodes with the described
+                # path and without the parents, which can not be rebuilt
+                raise ValueError('Unsupported save format in {}, only checkpoints can be resumed'
+                                 .format(self.save_file_path))
+            checkpoint = load_checkpoint(self.save_file_path, type(initial_state))
+            (self.amount_solutions, self.amount_nodes_visited, self.max_size_frontier,
+             self.t0_total_runtime) = checkpoint[:4]
+            frontier = frontier_mode.load_frontier(checkpoint.frontier_nodes)
         else:
-            initial_node = Node(initial_state, [], 0)
+            initial_node = Node(initial_state)
             frontier = frontier_mode.create_frontier()
             frontier_mode.add_neighbors_to_frontier(frontier, [initial_node])
         self.t0_actual_runtime = time.perf_counter()
+        self.next_checkpoint_time = self.t0_actual_runtime + self.checkpoint_every_x_secs
+        self.next_checkpoint_nodes_visited = self.amount_nodes_visited + self.checkpoint_every_x_nodes_visited
         return frontier
 
     def after_iteration(self, frontier_size, partial_solution):
@@ -83,34 +114,72 @@ class DebugMode:
                     self.amount_solutions % self.show_every_x_solutions == 0:
                 self._show_debug()
 
+    def add_statistics(self, amount_solutions: int, amount_nodes_visited: int, max_size_frontier: int):
+        """ Add the statistics of a search done elsewhere, like in another process """
+        show = self.show_every_x_nodes_visited != 0 and \
+            (self.amount_nodes_visited + amount_nodes_visited) // self.show_every_x_nodes_visited > \
+            self.amount_nodes_visited // self.show_every_x_nodes_visited
+        show = show or self.show_every_x_solutions != 0 and \
+            (self.amount_solutions + amount_solutions) // self.show_every_x_solutions > \
+            self.amount_solutions // self.show_every_x_solutions
+        self.amount_solutions += amount_solutions
+        self.amount_nodes_visited += amount_nodes_visited
+        if max_size_frontier > self.max_size_frontier:
+            self.max_size_frontier = max_size_frontier
+        if show:
+            self._show_debug()
+
+    def is_checkpoint_due(self) -> bool:
+        if not self.save_file_path:
+            return False
+        if self.checkpoint_every_x_nodes_visited != 0 and \
+                self.amount_nodes_visited >= self.next_checkpoint_nodes_visited:
+            return True
+        return self.checkpoint_every_x_secs != 0 and time.perf_counter() >= self.next_checkpoint_time
+
+    def save(self, frontier):
+        """ Save the statistics and the frontier, the search can be resumed from them by
+        initialization
+        """
+        now = time.perf_counter()
+        save_checkpoint(self.save_file_path, Checkpoint(
+            self.amount_solutions, self.amount_nodes_visited, self.max_size_frontier,
+            now - self.t0_actual_runtime + self.t0_total_runtime,
+            self.frontier_mode.dump_frontier(frontier)))
+        self.next_checkpoint_time = now + self.checkpoint_every_x_secs
+        self.next_checkpoint_nodes_visited = self.amount_nodes_visited + self.checkpoint_every_x_nodes_visited
+
+    def export_metrics(self, size_frontier: int):
+        self.metrics.export(self.amount_nodes_visited, self.amount_solutions, size_frontier,
+                            self.max_size_frontier)
+
     def finalization(self, frontier):
-        t_actual_runtime = time.perf_counter() - self.t0_actual_runtime
-        if STOP:
-            data = (self.amount_solutions, self.amount_nodes_visited, frontier,
-                    self.max_size_frontier, t_actual_runtime + self.t0_total_runtime)
-            pickle.dump(data, open(self.save_file_path, "wb"))
+        if self.is_stop() and self.save_file_path:
+            self.save(frontier)
+        elif self.save_file_path and os.path.isfile(self.save_file_path) and \
+                (self.checkpoint_every_x_secs != 0 or self.checkpoint_every_x_nodes_visited != 0):
+            # The search finished, a periodic checkpoint would resume it again
+            os.remove(self.save_file_path)
+        if self.metrics is not None:
+            self.export_metrics(len(frontier))
         self._show_debug()
+        self.finished.set()
         if self.thread_show:
             self.thread_show.join()
-        self.thread_quit.join()
         return self.amount_solutions
 
-    @staticmethod
-    def is_stop():
-        return STOP
+    def is_stop(self):
+        return self.cancel_token.is_cancelled()
 
     def _show_every_x_seconds(self, secs):
-        while STOP is False:
-            time.sleep(secs)
+        while not self.is_stop() and not self.finished.wait(secs):
             self._show_debug()
 
-    @staticmethod
-    def _quit_program():
-        global STOP
-        while STOP is False:
+    def _quit_program(self):
+        while not self.is_stop():
             inp = input("PRESS 'A' KEY AND ENTER TO EXIT THE PROGRAM\n")
-            if inp is 'a':
-                STOP = True
+            if inp == 'a':
+                self.cancel_token.cancel()
 
     def _show_debug(self):
         if self.show_amount_solutions:
@@ -0,0 +1,180 @@
+""" Table of the states that can reach a goal state, with their distance, built once backward from
+the goal states and read from a memory mapped file
+
+The file has a header and then one entry per state, the state packed with State.pack followed by
+one byte with the amount of moves of its shortest path to a goal state. The entries are sorted by
+their packed state, so a lookup is a binary search over the mapped pages and the file can be
+shared read only between processes. State.pack must give the same length for all the states and
+the moves must have the same cost
+"""
+import heapq
+import mmap
+import os
+import struct
+from typing import Type, Iterable, Union, Container, Iterator, Tuple
+
+from .Structures import State, Node, Solution, PartialSolution, FoundSolution
+from .GenerateNeighbors import GenerateNeighbors
+from .FrontierMode import FrontierMode
+from .VisitedMode import VisitedMode
+from .ExternalFrontier import ExternalFrontier, _iterate_records
+from .PruningRule import PruningRule, Pruner
+from .SearchAlgorithm import SearchAlgorithm
+
+# Magic, size of the packed states and max depth, _COMPLETE if the sweep was not limited
+_HEADER = struct.Struct('<8sII')
+_MAGIC = b'ENDGAME1'
+_COMPLETE = 0xFFFFFFFF
+_MAX_DISTANCE = 255
+
+
+def _tag(records: Iterator[bytes], distance: int) -> Iterator[Tuple[bytes, int]]:
+    for record in records:
+        yield record, distance
+
+
+class EndgameDatabase(Container[State]):
+    """ Read only view of a database file made by build. A state is in the database if it can
+    reach a goal state in at most max_depth moves, or at all if max_depth is None
+    """
+    def __init__(self, path: str, state_type: Type[State]):
+        self.path = path
+        self.state_type = state_type
+        with open(path, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.record_size, max_depth = _HEADER.unpack_from(self.data)
+        if magic != _MAGIC:
+            raise ValueError('{} is not an endgame database'.format(path))
+        self.max_depth = None if max_depth == _COMPLETE else max_depth
+        self.entry_size = self.record_size + 1
+        self.amount_states = (len(self.data) - _HEADER.size) // self.entry_size
+
+    @staticmethod
+    def build(
+            path: str,
+            state_type: Type[State],
+            generate_neighbors: Type[GenerateNeighbors],
+            goal_states: Iterable[State],
+            max_depth: int = None,
+            run_size: int = 1000000,
+            directory: str = None
+    ) -> 'EndgameDatabase':
+        """ Retrograde breadth first sweep from the goal states with
+        GenerateNeighbors.generate_predecessors, the layers are kept on disk like in
+        FrontierModeExternalBFS and merged into the file at the end
+
+        :param goal_states: they must be listed, like in a GoalSet
+        :param max_depth: the states farther from the goal states are left out, at most 255
+        """
+        if max_depth is not None and max_depth > _MAX_DISTANCE:
+            raise ValueError('The endgame database only stores distances up to {}'.format(_MAX_DISTANCE))
+        frontier = ExternalFrontier(state_type, run_size, None, directory)
+        for goal_state in goal_states:
+            frontier.add(goal_state)
+        while len(frontier):
+            node = frontier.pop()
+            if node.cost == max_depth:
+                break
+            if node.cost == _MAX_DISTANCE:
+                raise ValueError('The endgame database only stores distances up to {}'.format(_MAX_DISTANCE))
+            for predecessor in generate_neighbors.generate_predecessors(node, (), ()):
+                frontier.add(predecessor.state)
+        # Each layer file is sorted and has the states of its depth only, the layer of depth i is
+        # the i-th file
+        entries = heapq.merge(*(_tag(_iterate_records(layer_path, frontier.record_size), depth)
+                                for depth, layer_path in enumerate(frontier.layer_paths)))
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, frontier.record_size or 0,
+                                    _COMPLETE if max_depth is None else max_depth))
+            file.writelines(record + bytes((distance,)) for record, distance in entries)
+        os.replace(temporary_path, path)
+        return EndgameDatabase(path, state_type)
+
+    def distance(self, state: State) -> Union[int, None]:
+        """ Amount of moves of the shortest path from state to a goal state, None if it is not in
+        the database
+        """
+        record = state.pack()
+        data = self.data
+        record_size = self.record_size
+        entry_size = self.entry_size
+        low = 0
+        high = self.amount_states
+        while low < high:
+            middle = (low + high) // 2
+            position = _HEADER.size + middle * entry_size
+            if data[position:position + record_size] < record:
+                low = middle + 1
+            else:
+                high = middle
+        position = _HEADER.size + low * entry_size
+        if low < self.amount_states and data[position:position + record_size] == record:
+            return data[position + record_size]
+        return None
+
+    def __contains__(self, state) -> bool:
+        return self.distance(state) is not None
+
+    def __len__(self) -> int:
+        return self.amount_states
+
+    def continue_to_goal(self, node: Node, generate_neighbors: Type[GenerateNeighbors]) -> Node:
+        """ Node of a goal state reached from the node of a state in the database, following the
+        neighbors one move closer each time
+        """
+        distance = self.distance(node.state)
+        while distance:
+            distance -= 1
+            node = next(neighbor for neighbor in generate_neighbors.generate_neighbors(node, (), ())
+                        if self.distance(neighbor.state) == distance)
+        return node
+
+    def find_solution(
+            self,
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            pruner: Pruner = None
+    ) -> Solution:
+        """ SearchAlgorithmIterative.find_solution to the goal states of the database, the search
+        stops at the first state in the database and the rest of the path is read from it. If
+        the initial state is in the database there is no search at all. Give a pruner with an
+        EndgameRule so the states the database proves dead are not expanded
+        """
+        frontier_mode.check_keeps_paths()
+        frontier = frontier_mode.create_frontier()
+        frontier_mode.add_neighbors_to_frontier(frontier, [Node(initial_state)])
+        visited_states = visited_mode.create_visited()
+        partial_solution = PartialSolution(FoundSolution.NO_YET, None)
+        while partial_solution.found_solution == FoundSolution.NO_YET:
+            partial_solution = SearchAlgorithm._find_solution_iteration(
+                frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
+                frontier, visited_states, self, pruner)
+        node = partial_solution.node
+        if partial_solution.found_solution == FoundSolution.YES:
+            node = self.continue_to_goal(node, generate_neighbors)
+        return SearchAlgorithm._solution_from_node(generate_neighbors, node)
+
+    def close(self):
+        self.data.close()
+
+
+class EndgameRule(PruningRule):
+    """ Prune the states that the database proves can not reach a goal state, the ones it covers
+    and does not have. Subclass it to set database and, if it was built with a max_depth, is_covered
+    """
+    database: EndgameDatabase = None
+
+    @classmethod
+    def is_covered(cls, state: State) -> bool:
+        """ If the state would be in the database when it can reach a goal state. By default only
+        with a database built without max_depth
+        """
+        return cls.database.max_depth is None
+
+    @classmethod
+    def is_dead(cls, state: State) -> bool:
+        return cls.is_covered(state) and state not in cls.database
@@ -0,0 +1,129 @@
+""" Breadth first frontier kept on disk as sorted runs of packed states
+
+The nodes of the next layer are packed with State.pack and buffered in memory. When the buffer
+has run_size states it is sorted, its duplicates removed and it is written as a run file. When
+the current layer is exhausted the runs are merged into the layer file, streaming, leaving out
+the states of the earlier layer files (delayed duplicate detection), and the new layer is read
+from its memory mapped file. All the reads and writes are sequential.
+
+State.pack must give the same length for all the states. The nodes taken from the frontier only
+keep their state and their depth as cost, the parents and moves are not stored
+"""
+import heapq
+import mmap
+import os
+import shutil
+import tempfile
+import weakref
+from typing import List, Iterator, Type, Iterable, Union
+
+from .Structures import Node, State
+
+
+def _iterate_records(path: str, record_size: int) -> Iterator[bytes]:
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for position in range(0, len(data), record_size):
+            yield data[position:position + record_size]
+
+
+def _unique(records: Iterable[bytes]) -> Iterator[bytes]:
+    """ The sorted records without the repeated ones """
+    last = None
+    for record in records:
+        if record != last:
+            yield record
+            last = record
+
+
+def _difference(records: Iterable[bytes], removed: Iterable[bytes]) -> Iterator[bytes]:
+    """ The sorted records that are not in the sorted removed """
+    removed = iter(removed)
+    removed_record = next(removed, None)
+    for record in records:
+        while removed_record is not None and removed_record < record:
+            removed_record = next(removed, None)
+        if record != removed_record:
+            yield record
+
+
+class ExternalFrontier:
+    def __init__(self, state_type: Type[State], run_size: int, duplicate_layers: Union[int, None],
+                 directory: str = None):
+        self.state_type = state_type
+        self.run_size = run_size
+        self.duplicate_layers = duplicate_layers
+        self.path = tempfile.mkdtemp(prefix='frontier-', dir=directory)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.path, True)
+        self.record_size = None
+        self.depth = -1
+        # Sorted files of the layers already merged, the last one is the current layer
+        self.layer_paths: List[str] = []
+        self.layer_size = 0
+        self.layer_records: Iterator[bytes] = iter(())
+        self.layer_remaining = 0
+        # Next layer, runs on disk plus the buffer
+        self.run_paths: List[str] = []
+        self.buffer: List[bytes] = []
+        self.amount_pending = 0
+
+    def __len__(self):
+        if self.layer_remaining == 0 and self.amount_pending:
+            # Merged now, so an empty frontier is not taken as having nodes because of duplicates
+            self._next_layer()
+        # The pending states may still have duplicates, they are removed when merged
+        return self.layer_remaining + self.amount_pending
+
+    def add(self, state: State):
+        record = state.pack()
+        if self.record_size is None:
+            self.record_size = len(record)
+        elif len(record) != self.record_size:
+            raise ValueError('The external frontier needs all the packed states of the same length')
+        self.buffer.append(record)
+        self.amount_pending += 1
+        if len(self.buffer) >= self.run_size:
+            self._write_run()
+
+    def pop(self) -> Node:
+        if self.layer_remaining == 0 and self.amount_pending:
+            self._next_layer()
+        if self.layer_remaining == 0:
+            raise IndexError('pop from an empty external frontier')
+        self.layer_remaining -= 1
+        return Node(self.state_type.unpack(next(self.layer_records)), cost=self.depth)
+
+    def _write_run(self):
+        self.buffer.sort()
+        run_path = os.path.join(self.path, 'run-{}-{}'.format(self.depth + 1, len(self.run_paths)))
+        with open(run_path, 'wb') as file:
+            file.write(b''.join(_unique(self.buffer)))
+        self.run_paths.append(run_path)
+        self.buffer = []
+
+    def _next_layer(self):
+        """ Merge the runs of the next layer into its file, without the states of earlier layers """
+        if self.buffer:
+            self._write_run()
+        self.depth += 1
+        records = _unique(heapq.merge(*(_iterate_records(run_path, self.record_size)
+                                        for run_path in self.run_paths)))
+        earlier_paths = self.layer_paths if self.duplicate_layers is None \
+            else self.layer_paths[max(0, len(self.layer_paths) - self.duplicate_layers):]
+        if earlier_paths:
+            records = _difference(records, heapq.merge(*(_iterate_records(layer_path, self.record_size)
+                                                         for layer_path in earlier_paths)))
+        layer_path = os.path.join(self.path, 'layer-{}'.format(self.depth))
+        with open(layer_path, 'wb') as file:
+            file.writelines(records)
+        self.layer_size = os.path.getsize(layer_path) // self.record_size
+        for run_path in self.run_paths:
+            os.remove(run_path)
+        self.run_paths = []
+        self.amount_pending = 0
+        self.layer_paths.append(layer_path)
+        if self.duplicate_layers is not None and len(self.layer_paths) > self.duplicate_layers + 1:
+            os.remove(self.layer_paths.pop(0))
+        self.layer_remaining = self.layer_size
+        self.layer_records = _iterate_records(layer_path, self.record_size)
@@ -1,10 +1,22 @@
 import abc
-from typing import Collection, List
+import functools
+import heapq
+import itertools
+from collections import Counter, deque
+from typing import Collection, List, Type, Deque, Dict, Hashable, Iterable, Callable
 
-from .Structures import Node
+from .Structures import Node, State
+from .ExternalFrontier import ExternalFrontier
 
 
 class FrontierMode(abc.ABC):
+    # Lazy modes receive the neighbors as an iterator from GenerateNeighbors.iterate_neighbors
+    lazy: bool = False
+    # Modes that drop the parents of the nodes can not rebuild the path of a solution
+    keeps_paths: bool = True
+    # Modes whose frontier can not be listed by dump_frontier can not be saved by the debug mode
+    can_save: bool = True
+
     @staticmethod
     @abc.abstractmethod
     def create_frontier() -> Collection[Node]:
@@ -20,6 +32,58 @@ class FrontierMode(abc.ABC):
     def add_neighbors_to_frontier(frontier: Collection[Node], neighbors: List[Node]):
         pass
 
+    @staticmethod
+    def contains_state(frontier: Collection[Node], state: State) -> bool:
+        return any(node.state == state for node in frontier)
+
+    @staticmethod
+    def dump_frontier(frontier: Collection[Node]) -> List[Node]:
+        """ Nodes of the frontier, in the order load_frontier needs to rebuild it """
+        return list(frontier)
+
+    @classmethod
+    def drain_frontier(cls, frontier: Collection[Node]) -> List[Node]:
+        """ Select all the nodes of the frontier, in the order they would be explored """
+        nodes = []
+        while frontier:
+            nodes.append(cls.select_node(frontier))
+        return nodes
+
+    @classmethod
+    def load_frontier(cls, nodes: List[Node]) -> Collection[Node]:
+        frontier = cls.create_frontier()
+        cls.add_neighbors_to_frontier(frontier, nodes)
+        return frontier
+
+    @classmethod
+    def check_keeps_paths(cls):
+        """ Raise ValueError for a mode that can not give the path of a solution, used by find_solution """
+        if not cls.keeps_paths:
+            raise ValueError('{} does not keep the paths of the solutions, it can only count them'.format(
+                cls.__name__))
+
+    @classmethod
+    def check_can_save(cls):
+        """ Raise ValueError for a mode whose frontier can not be saved, used by DebugMode """
+        if not cls.can_save:
+            raise ValueError('{} can not save its frontier, run it without save_file_path'.format(
+                cls.__name__))
+
+    @classmethod
+    def bind_select_node(cls, frontier: Collection[Node]) -> Callable[[], Node]:
+        """ select_node of frontier, used by the fused search loop. Override it with a method of
+        the frontier to save a call per node
+        """
+        return functools.partial(cls.select_node, frontier)
+
+    @classmethod
+    def bind_add_neighbors_to_frontier(cls, frontier: Collection[Node]) -> Callable[[List[Node]], None]:
+        return functools.partial(cls.add_neighbors_to_frontier, frontier)
+
+    @classmethod
+    def bind_contains_state(cls, frontier: Collection[Node]) -> Callable[[State], bool]:
+        return functools.partial(cls.contains_state, frontier)
+
 
 class FrontierModeDFS(FrontierMode):
     @staticmethod
@@ -33,3 +97,273 @@ class FrontierModeDFS(FrontierMode):
     @staticmethod
     def add_neighbors_to_frontier(frontier: List[Node], neighbors: List[Node]):
         frontier.extend(neighbors)
+
+    @staticmethod
+    def bind_select_node(frontier: List[Node]):
+        return frontier.pop
+
+    @staticmethod
+    def bind_add_neighbors_to_frontier(frontier: List[Node]):
+        return frontier.extend
+
+
+class LazyFrontier:
+    """ Stack of suspended neighbor iterators, each one with its next node already pulled
+
+    Iterating it only gives the pulled nodes. When pickled the iterators are drained into lists
+    """
+    def __init__(self):
+        self.stack: List[list] = []
+
+    def __len__(self):
+        return len(self.stack)
+
+    def __iter__(self):
+        return (entry[0] for entry in self.stack)
+
+    def __getstate__(self):
+        lists = [[entry[0]] + list(entry[1]) for entry in self.stack]
+        for entry, nodes in zip(self.stack, lists):
+            entry[1] = iter(nodes[1:])
+        return lists
+
+    def __setstate__(self, lists):
+        self.stack = [[nodes[0], iter(nodes[1:])] for nodes in lists]
+
+
+class FrontierModeDFSLazy(FrontierMode):
+    """ DFS that keeps one iterator per level instead of all the siblings, so the frontier is
+    O(depth). The neighbors are explored in the order they are generated
+    """
+    lazy = True
+
+    @staticmethod
+    def create_frontier() -> LazyFrontier:
+        return LazyFrontier()
+
+    @staticmethod
+    def select_node(frontier: LazyFrontier) -> Node:
+        entry = frontier.stack[-1]
+        node = entry[0]
+        next_node = next(entry[1], None)
+        if next_node is None:
+            frontier.stack.pop()
+        else:
+            entry[0] = next_node
+        return node
+
+    @staticmethod
+    def add_neighbors_to_frontier(frontier: LazyFrontier, neighbors: Iterable[Node]):
+        neighbors = iter(neighbors)
+        first_node = next(neighbors, None)
+        if first_node is not None:
+            frontier.stack.append([first_node, neighbors])
+
+    @staticmethod
+    def dump_frontier(frontier: LazyFrontier) -> List[Node]:
+        # In the order they will be explored, load_frontier adds them as a single iterator
+        return [node for nodes in reversed(frontier.__getstate__()) for node in nodes]
+
+
+class FrontierModeBFS(FrontierMode):
+    @staticmethod
+    def create_frontier() -> Deque[Node]:
+        return deque()
+
+    @staticmethod
+    def select_node(frontier: Deque[Node]):
+        return frontier.popleft()
+
+    @staticmethod
+    def add_neighbors_to_frontier(frontier: Deque[Node], neighbors: List[Node]):
+        frontier.extend(neighbors)
+
+    @staticmethod
+    def bind_select_node(frontier: Deque[Node]):
+        return frontier.popleft
+
+    @staticmethod
+    def bind_add_neighbors_to_frontier(frontier: Deque[Node]):
+        return frontier.extend
+
+
+class FrontierModeExternalBFS(FrontierMode):
+    """ BFS with the frontier on disk, see ExternalFrontier. The repeated states are removed
+    when a layer is merged, comparing with the duplicate_layers previous layers (all if None),
+    so contains_state is always False and frontier_remove_repeated is not needed. Two layers are
+    enough if every move can be undone, none if the states of a layer can not be in other layers
+
+    Subclass it and set state_type, the temporary files go in directory (the system one if None)
+    and run_size packed states are kept in memory before writing them. The nodes do not keep
+    their parents, so it can count the solutions but find_solution raises ValueError. The layers
+    may not fit in memory, so the frontier is not saved and a DebugMode with save_file_path
+    raises ValueError
+    """
+    keeps_paths = False
+    can_save = False
+    state_type: Type[State] = None
+    directory: str = None
+    run_size: int = 1000000
+    duplicate_layers: int = None
+
+    @classmethod
+    def create_frontier(cls) -> ExternalFrontier:
+        return ExternalFrontier(cls.state_type, cls.run_size, cls.duplicate_layers, cls.directory)
+
+    @staticmethod
+    def select_node(frontier: ExternalFrontier) -> Node:
+        return frontier.pop()
+
+    @staticmethod
+    def add_neighbors_to_frontier(frontier: ExternalFrontier, neighbors: Iterable[Node]):
+        for neighbor in neighbors:
+            frontier.add(neighbor.state)
+
+    @staticmethod
+    def contains_state(frontier: ExternalFrontier, state: State) -> bool:
+        return False
+
+    @staticmethod
+    def bind_select_node(frontier: ExternalFrontier):
+        return frontier.pop
+
+
+class IndexedFrontier:
+    """ A frontier plus a count of the keys of the states it holds """
+    def __init__(self, nodes: Collection[Node]):
+        self.nodes = nodes
+        self.keys = Counter()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+
+class FrontierModeIndexed(FrontierMode):
+    """ Wrap base_mode keeping an index of the states in the frontier, so contains_state is O(1)
+
+    The states must implement State.key. Subclass it and set base_mode to use it, like
+    FrontierModeDFSIndexed. With canonical set the index uses State.canonical_key, so a state
+    is in the frontier if a symmetric one is. Then the solutions are found but not all counted,
+    see State.canonical_key
+    """
+    base_mode: Type[FrontierMode] = None
+    canonical: bool = False
+
+    @classmethod
+    def _index_key(cls, state: State):
+        return state.canonical_key() if cls.canonical else state.key()
+
+    @classmethod
+    def create_frontier(cls) -> IndexedFrontier:
+        return IndexedFrontier(cls.base_mode.create_frontier())
+
+    @classmethod
+    def select_node(cls, frontier: IndexedFrontier) -> Node:
+        node = cls.base_mode.select_node(frontier.nodes)
+        key = cls._index_key(node.state)
+        frontier.keys[key] -= 1
+        if frontier.keys[key] == 0:
+            del frontier.keys[key]
+        return node
+
+    @classmethod
+    def add_neighbors_to_frontier(cls, frontier: IndexedFrontier, neighbors: List[Node]):
+        cls.base_mode.add_neighbors_to_frontier(frontier.nodes, neighbors)
+        frontier.keys.update(cls._index_key(neighbor.state) for neighbor in neighbors)
+
+    @classmethod
+    def contains_state(cls, frontier: IndexedFrontier, state: State) -> bool:
+        return cls._index_key(state) in frontier.keys
+
+
+class FrontierModeDFSIndexed(FrontierModeIndexed):
+    base_mode = FrontierModeDFS
+
+
+class FrontierModeDFSIndexedCanonical(FrontierModeIndexed):
+    base_mode = FrontierModeDFS
+    canonical = True
+
+
+class FrontierModeBFSIndexed(FrontierModeIndexed):
+    base_mode = FrontierModeBFS
+
+
+class PriorityFrontier:
+    """ Heap of nodes with at most one live node per state key
+
+    When a state is reached again more cheaply the new node replaces the old one, which stays in
+    the heap and is skipped when popped (lazy deletion)
+    """
+    def __init__(self):
+        self.heap: List = []
+        self.live_nodes: Dict[Hashable, Node] = {}
+        self.order = itertools.count()
+
+    def __len__(self):
+        return len(self.live_nodes)
+
+    def __iter__(self):
+        return iter(self.live_nodes.values())
+
+
+class FrontierModePriority(FrontierMode):
+    """ Select the node with the lowest priority, the states must implement State.key
+
+    The frontier keeps only the cheapest node of each state, so contains_state is always False
+    and frontier_remove_repeated only removes the visited states
+    """
+    @staticmethod
+    @abc.abstractmethod
+    def priority(node: Node):
+        pass
+
+    @staticmethod
+    def create_frontier() -> PriorityFrontier:
+        return PriorityFrontier()
+
+    @staticmethod
+    def select_node(frontier: PriorityFrontier) -> Node:
+        while True:
+            node = heapq.heappop(frontier.heap)[2]
+            key = node.state.key()
+            if frontier.live_nodes.get(key) is node:
+                del frontier.live_nodes[key]
+                return node
+
+    @classmethod
+    def add_neighbors_to_frontier(cls, frontier: PriorityFrontier, neighbors: List[Node]):
+        for neighbor in neighbors:
+            key = neighbor.state.key()
+            live_node = frontier.live_nodes.get(key)
+            if live_node is None or neighbor.cost < live_node.cost:
+                frontier.live_nodes[key] = neighbor
+                # Ties go to the newest node, so plateaus are explored depth first
+                heapq.heappush(frontier.heap, (cls.priority(neighbor), -next(frontier.order), neighbor))
+
+    @staticmethod
+    def contains_state(frontier: PriorityFrontier, state: State) -> bool:
+        # A state already in the frontier may be reached now more cheaply, add_neighbors_to_frontier
+        # keeps the cheapest node of each state
+        return False
+
+
+class FrontierModeUniformCost(FrontierModePriority):
+    @staticmethod
+    def priority(node: Node):
+        return node.cost
+
+
+class FrontierModeGreedy(FrontierModePriority):
+    @staticmethod
+    def priority(node: Node):
+        return node.state.heuristic()
+
+
+class FrontierModeAStar(FrontierModePriority):
+    @staticmethod
+    def priority(node: Node):
+        return node.cost + node.state.heuristic()
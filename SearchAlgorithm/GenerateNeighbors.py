@@ -1,5 +1,5 @@
 import abc
-from typing import Collection, List
+from typing import Collection, List, Hashable, Iterator
 
 from .Structures import Node, State
 
@@ -13,3 +13,33 @@ class GenerateNeighbors(abc.ABC):
             visited_states: Collection[State]
     ) -> List[Node]:
         pass
+
+    @classmethod
+    def iterate_neighbors(
+            cls,
+            actual_node: Node,
+            frontier: Collection[Node],
+            visited_states: Collection[State]
+    ) -> Iterator[Node]:
+        """ Neighbors generated on demand, used by the lazy frontier modes. Override it with a
+        generator to avoid building the siblings that are never explored
+        """
+        return iter(cls.generate_neighbors(actual_node, frontier, visited_states))
+
+    @classmethod
+    def generate_predecessors(
+            cls,
+            actual_node: Node,
+            frontier: Collection[Node],
+            visited_states: Collection[State]
+    ) -> List[Node]:
+        """ Nodes of the states from which one move reaches the state of actual_node, used by the
+        bidirectional search. Their parent is actual_node and their move is the one that goes
+        from their state to the state of actual_node, so the backward path is in forward order
+        """
+        raise NotImplementedError('{} does not define generate_predecessors'.format(cls.__name__))
+
+    @staticmethod
+    def describe_move(move: Hashable) -> str:
+        """ Text of a move code in the paths of the solutions """
+        return str(move)
@@ -0,0 +1,39 @@
+import abc
+from typing import List, Tuple
+
+import numpy as np
+
+from .Structures import State
+from .GenerateNeighbors import GenerateNeighbors
+
+
+class GenerateNeighborsBatch(GenerateNeighbors):
+    """ Generate the neighbors of many states at once with NumPy, used by SearchAlgorithmBatch
+
+    The states of a batch are the rows of an array (the first axis), in the encoding chosen by
+    to_array. Two states are equal if and only if their rows are equal
+    """
+    @staticmethod
+    @abc.abstractmethod
+    def to_array(states: List[State]) -> np.ndarray:
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def from_array(states: np.ndarray) -> List[State]:
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def expand(states: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """ Neighbors of all the states
+
+        :return: the neighbors, the index in states of the state each one comes from and the
+            move code of each one
+        """
+        pass
+
+    @staticmethod
+    def heuristic_array(states: np.ndarray) -> np.ndarray:
+        """ State.heuristic of all the states, used by the beam search to keep the best ones """
+        return np.zeros(len(states), dtype=np.int64)
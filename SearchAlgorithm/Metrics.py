@@ -0,0 +1,136 @@
+import abc
+import json
+import os
+import time
+from typing import Dict
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, the memory is not reported
+    resource = None
+
+PHASES = ('select_node', 'is_goal', 'prune', 'generate_neighbors', 'remove_repeated_neighbors',
+          'add_neighbors_to_frontier')
+
+
+class MetricsSink(abc.ABC):
+    @abc.abstractmethod
+    def write(self, metrics: Dict[str, float]) -> None:
+        pass
+
+
+class JsonLinesSink(MetricsSink):
+    """ Append each export as a JSON object in a line of path """
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, metrics: Dict[str, float]) -> None:
+        with open(self.path, 'a') as file:
+            file.write(json.dumps(metrics) + '\n')
+
+
+class PrometheusTextfileSink(MetricsSink):
+    """ Write the last export as gauges in the Prometheus text format, for the textfile collector
+
+    The file is replaced atomically, so the collector never reads it half written
+    """
+    def __init__(self, path: str, prefix: str = 'search_'):
+        self.path = path
+        self.prefix = prefix
+
+    def write(self, metrics: Dict[str, float]) -> None:
+        lines = []
+        for name, value in metrics.items():
+            lines.append('# TYPE {}{} gauge'.format(self.prefix, name))
+            lines.append('{}{} {}'.format(self.prefix, name, value))
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+        os.replace(temporary_path, self.path)
+
+
+class SearchMetrics:
+    """ Sampled profiling of the phases of the search iterations
+
+    One of every sample_every_x_iterations iterations is timed phase by phase and its
+    neighbors are counted, the rest run without instrumentation. The metrics are written to
+    sink at most every export_every_x_secs, checked only in the sampled iterations
+    """
+    def __init__(
+            self,
+            sink: MetricsSink,
+            sample_every_x_iterations: int = 100,
+            export_every_x_secs: int = 10
+    ):
+        self.sink = sink
+        self.sample_every_x_iterations = sample_every_x_iterations
+        self.export_every_x_secs = export_every_x_secs
+        self.iterations_to_sample = sample_every_x_iterations
+        self.phase_seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.sampled_iterations = 0
+        self.sampled_expansions = 0
+        self.neighbors_generated = 0
+        self.neighbors_repeated = 0
+        self.last_export_time = time.perf_counter()
+        self.last_export_nodes_visited = 0
+        self.lap_start = 0.0
+
+    def should_sample(self) -> bool:
+        self.iterations_to_sample -= 1
+        if self.iterations_to_sample > 0:
+            return False
+        self.iterations_to_sample = self.sample_every_x_iterations
+        return True
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        self.phase_seconds[phase] += seconds
+
+    def start_iteration(self) -> None:
+        self.sampled_iterations += 1
+        self.lap_start = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """ Add to phase the time since the previous lap, or since start_iteration """
+        now = time.perf_counter()
+        self.phase_seconds[phase] += now - self.lap_start
+        self.lap_start = now
+
+    def is_export_due(self) -> bool:
+        return time.perf_counter() - self.last_export_time >= self.export_every_x_secs
+
+    def export(
+            self,
+            amount_nodes_visited: int,
+            amount_solutions: int,
+            size_frontier: int,
+            max_size_frontier: int
+    ) -> None:
+        now = time.perf_counter()
+        nodes_per_second = (amount_nodes_visited - self.last_export_nodes_visited) / \
+            max(now - self.last_export_time, 1e-9)
+        metrics = {
+            'timestamp': time.time(),
+            'nodes_visited': amount_nodes_visited,
+            'solutions': amount_solutions,
+            'frontier_size': size_frontier,
+            'frontier_max_size': max_size_frontier,
+            'nodes_per_second': nodes_per_second,
+            'sampled_iterations': self.sampled_iterations,
+        }
+        if self.sampled_expansions:
+            metrics['branching_factor'] = self.neighbors_generated / self.sampled_expansions
+        if self.neighbors_generated:
+            metrics['duplicate_hit_rate'] = self.neighbors_repeated / self.neighbors_generated
+        if self.sampled_iterations:
+            sampled_seconds = sum(self.phase_seconds.values())
+            for phase, seconds in self.phase_seconds.items():
+                metrics[phase + '_seconds_per_iteration'] = seconds / self.sampled_iterations
+                if sampled_seconds:
+                    metrics[phase + '_time_share'] = seconds / sampled_seconds
+        if resource is not None:
+            # ru_maxrss is in kilobytes on Linux
+            metrics['max_rss_bytes'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        self.sink.write(metrics)
+        self.last_export_time = now
+        self.last_export_nodes_visited = amount_nodes_visited
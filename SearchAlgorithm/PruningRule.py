@@ -0,0 +1,39 @@
+import abc
+from collections import Counter
+from typing import Sequence, Type, Callable, List
+
+from .Structures import Node, State
+
+
+class PruningRule(abc.ABC):
+    """ Condition proving that a state can not reach a goal state, the nodes of those states are
+    not expanded. A rule that prunes a state that can reach a goal loses solutions
+    """
+    @staticmethod
+    @abc.abstractmethod
+    def is_dead(state: State) -> bool:
+        pass
+
+
+class Pruner:
+    """ Rules checked in order before expanding each node, with the amount of nodes each one pruned
+    in hits by rule name
+
+    :param order_neighbors: optional, reorders the neighbors before they are added to the
+        frontier, like for DFS the last one is explored first. Not used by the lazy frontier modes
+    """
+    def __init__(
+            self,
+            rules: Sequence[Type[PruningRule]],
+            order_neighbors: Callable[[List[Node]], List[Node]] = None
+    ):
+        self.rules = rules
+        self.order_neighbors = order_neighbors
+        self.hits: Counter = Counter()
+
+    def prune(self, node: Node) -> bool:
+        for rule in self.rules:
+            if rule.is_dead(node.state):
+                self.hits[rule.__name__] += 1
+                return True
+        return False
@@ -1,11 +1,13 @@
 import abc
-from typing import Collection, Type, List
+from typing import Collection, Type, List, Iterator, Callable, Union
 
 from .Structures import State, Solution, PartialSolution, Node, FoundSolution
 from .GenerateNeighbors import GenerateNeighbors
 from .FrontierMode import FrontierMode
 from .VisitedMode import VisitedMode
 from .DebugMode import DebugMode
+from .Metrics import SearchMetrics
+from .PruningRule import Pruner
 
 
 class SearchAlgorithm(abc.ABC):
@@ -26,7 +28,8 @@ class SearchAlgorithm(abc.ABC):
         :param visited_mode:
         :param frontier_mode:
         :param initial_state: The state in which the problem start
-        :param goal_states: All the possible states that are valid solution to the problem
+        :param goal_states: All the possible states that are valid solution to the problem, a GoalSet
+            avoids comparing with every goal state and a GoalPredicate avoids listing them
         :return: Return if the problem has a solution, and the path to the first solution found
         """
         pass
@@ -52,20 +55,69 @@ class SearchAlgorithm(abc.ABC):
             frontier_remove_repeated: bool,
             frontier: Collection[Node],
             visited_states: Collection[State],
-            goal_states: Collection[State]
+            goal_states: Collection[State],
+            pruner: Pruner = None,
+            metrics: SearchMetrics = None
     ) -> PartialSolution:
+        """ Select a node and expand it, with metrics timing each phase and counting the neighbors """
         if not frontier:
             return PartialSolution(FoundSolution.NO, None)
+        if metrics is not None:
+            metrics.start_iteration()
         actual_node = frontier_mode.select_node(frontier)
-        if SearchAlgorithm.is_goal(actual_node.state, goal_states):
-            return PartialSolution(FoundSolution.YES, actual_node.path)
+        if metrics is not None:
+            metrics.lap('select_node')
+        is_goal = SearchAlgorithm.is_goal(actual_node.state, goal_states)
+        if metrics is not None:
+            metrics.lap('is_goal')
+        if is_goal:
+            return PartialSolution(FoundSolution.YES, actual_node)
+        visited_mode.add_visited(visited_states, actual_node.state)
+        if pruner is not None:
+            is_pruned = pruner.prune(actual_node)
+            if metrics is not None:
+                metrics.lap('prune')
+            if is_pruned:
+                return PartialSolution(FoundSolution.NO_YET, None)
+        if frontier_mode.lazy:
+            # The neighbors are generated while they are taken from the frontier, that time is
+            # in select_node and they can not be counted
+            neighbors = generate_neighbors.iterate_neighbors(actual_node, frontier, visited_states)
+            if frontier_remove_repeated:
+                neighbors = SearchAlgorithm.iterate_not_repeated_neighbors(
+                    neighbors, frontier_mode, visited_mode, frontier, visited_states)
+            if metrics is not None:
+                metrics.lap('generate_neighbors')
         else:
-            visited_mode.add_visited(visited_states, actual_node.state)
             neighbors = generate_neighbors.generate_neighbors(actual_node, frontier, visited_states)
+            if metrics is not None:
+                metrics.lap('generate_neighbors')
+                metrics.sampled_expansions += 1
+                metrics.neighbors_generated += len(neighbors)
+                amount_neighbors = len(neighbors)
             if frontier_remove_repeated:
-                SearchAlgorithm.remove_repeated_neighbors(neighbors, frontier, visited_states)
-            frontier_mode.add_neighbors_to_frontier(frontier, neighbors)
-            return PartialSolution(FoundSolution.NO_YET, None)
+                SearchAlgorithm.remove_repeated_neighbors(
+                    neighbors, frontier_mode, visited_mode, frontier, visited_states)
+            if pruner is not None and pruner.order_neighbors is not None:
+                neighbors = pruner.order_neighbors(neighbors)
+            if metrics is not None:
+                metrics.neighbors_repeated += amount_neighbors - len(neighbors)
+                metrics.lap('remove_repeated_neighbors')
+        frontier_mode.add_neighbors_to_frontier(frontier, neighbors)
+        if metrics is not None:
+            metrics.lap('add_neighbors_to_frontier')
+        return PartialSolution(FoundSolution.NO_YET, None)
+
+    @staticmethod
+    def _solution_from_node(generate_neighbors: Type[GenerateNeighbors], node: Union[Node, None]) -> Solution:
+        """ Solution with the described moves of the path to node, from the last one, or without
+        solution if node is None
+        """
+        if node is None:
+            return Solution(False, None)
+        path = [generate_neighbors.describe_move(move) for move in node.path]
+        path.reverse()
+        return Solution(True, path)
 
     @staticmethod
     def is_goal(actual_state: State, goal_states: Collection[State]) -> bool:
@@ -74,11 +126,47 @@ class SearchAlgorithm(abc.ABC):
     @staticmethod
     def remove_repeated_neighbors(
             neighbors: List[Node],
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
             frontier: Collection[Node],
             visited_states: Collection[State]
     ) -> None:
-        neighbors[:] = [neighbor for neighbor in neighbors if neighbor not in frontier and
-                        neighbor.state not in visited_states]
+        neighbors[:] = [neighbor for neighbor in neighbors
+                        if not frontier_mode.contains_state(frontier, neighbor.state) and
+                        not visited_mode.is_visited(visited_states, neighbor.state)]
+
+    @staticmethod
+    def iterate_not_repeated_neighbors(
+            neighbors: Iterator[Node],
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            frontier: Collection[Node],
+            visited_states: Collection[State]
+    ) -> Iterator[Node]:
+        return (neighbor for neighbor in neighbors
+                if not frontier_mode.contains_state(frontier, neighbor.state) and
+                not visited_mode.is_visited(visited_states, neighbor.state))
+
+    @staticmethod
+    def _find_all_solutions_from_roots(
+            frontier_mode: Type[FrontierMode],
+            debug_mode: DebugMode,
+            initial_state: State,
+            count_solutions: Callable[[List[Node]], int]
+    ) -> int:
+        """ find_all_solutions of the searches that do not keep a frontier. The frontier mode is
+        only used to save and load the roots with the debug mode, the initial node or the nodes
+        of a saved frontier, and an interrupted search saves them again to start over
+
+        :param count_solutions: search from the roots and give the amount of solutions it did not
+            add to the debug mode
+        """
+        roots = frontier_mode.drain_frontier(debug_mode.initialization(initial_state, frontier_mode))
+        amount_solutions = count_solutions(roots)
+        if not debug_mode.is_stop():
+            debug_mode.add_statistics(amount_solutions, 0, 0)
+            roots = []
+        return debug_mode.finalization(frontier_mode.load_frontier(roots))
 
 
 class SearchAlgorithmIterative(SearchAlgorithm):
@@ -90,18 +178,30 @@ class SearchAlgorithmIterative(SearchAlgorithm):
         debug_mode: DebugMode,
         frontier_remove_repeated: bool,
         initial_state: State,
-        goal_states: Collection[State]
+        goal_states: Collection[State],
+        pruner: Pruner = None
     ) -> int:
         frontier = debug_mode.initialization(initial_state, frontier_mode)
         visited_states = visited_mode.create_visited()
+        metrics = debug_mode.metrics
         partial_solution = PartialSolution(FoundSolution.NO_YET, None)
         while not debug_mode.is_stop() and \
                 (partial_solution.found_solution == FoundSolution.NO_YET or
                  partial_solution.found_solution == FoundSolution.YES):
-            partial_solution = SearchAlgorithm._find_solution_iteration(
-                frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
-                frontier, visited_states, goal_states)
-            debug_mode.after_iteration(len(frontier), partial_solution)
+            if metrics is not None and metrics.should_sample():
+                partial_solution = SearchAlgorithm._find_solution_iteration(
+                    frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
+                    frontier, visited_states, goal_states, pruner, metrics)
+                debug_mode.after_iteration(len(frontier), partial_solution)
+                if metrics.is_export_due():
+                    debug_mode.export_metrics(len(frontier))
+            else:
+                partial_solution = SearchAlgorithm._find_solution_iteration(
+                    frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
+                    frontier, visited_states, goal_states, pruner)
+                debug_mode.after_iteration(len(frontier), partial_solution)
+            if debug_mode.is_checkpoint_due():
+                debug_mode.save(frontier)
         amount_solutions = debug_mode.finalization(frontier)
         return amount_solutions
 
@@ -112,9 +212,11 @@ class SearchAlgorithmIterative(SearchAlgorithm):
             generate_neighbors: Type[GenerateNeighbors],
             frontier_remove_repeated: bool,
             initial_state: State,
-            goal_states: Collection[State]
+            goal_states: Collection[State],
+            pruner: Pruner = None
     ) -> Solution:
-        initial_node = Node(initial_state, [], 0)
+        frontier_mode.check_keeps_paths()
+        initial_node = Node(initial_state)
         frontier = frontier_mode.create_frontier()
         frontier_mode.add_neighbors_to_frontier(frontier, [initial_node])
         visited_states = visited_mode.create_visited()
@@ -122,7 +224,5 @@ class SearchAlgorithmIterative(SearchAlgorithm):
         while partial_solution.found_solution == FoundSolution.NO_YET:
             partial_solution = SearchAlgorithm._find_solution_iteration(
                 frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
-                frontier, visited_states, goal_states)
-        if partial_solution.found_solution == FoundSolution.YES:
-            partial_solution.path.reverse()
-        return Solution(partial_solution.found_solution == FoundSolution.YES, partial_solution.path)
+                frontier, visited_states, goal_states, pruner)
+        return SearchAlgorithm._solution_from_node(generate_neighbors, partial_solution.node)
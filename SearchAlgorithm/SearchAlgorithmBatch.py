@@ -0,0 +1,157 @@
+from collections.abc import Collection as ListedCollection
+from typing import Collection, Type, List, Tuple, Union
+
+import numpy as np
+
+from .Structures import State, Solution, Node
+from .GenerateNeighborsBatch import GenerateNeighborsBatch
+from .FrontierMode import FrontierMode
+from .VisitedMode import VisitedMode, VisitedModeNone
+from .DebugMode import DebugMode
+from .SearchAlgorithm import SearchAlgorithm
+
+
+def _row_keys(states: np.ndarray) -> np.ndarray:
+    """ One comparable value per state, the bytes of its row """
+    if states.ndim == 1:
+        return states
+    states = np.ascontiguousarray(states).reshape(len(states), int(np.prod(states.shape[1:])))
+    return states.view(np.dtype((np.void, states.dtype.itemsize * states.shape[1])))[:, 0]
+
+
+def _merge(states: np.ndarray, amounts_paths: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ The states without repetitions, adding their amounts of paths
+
+    :return: the states, their amounts of paths and the index of the first occurrence of each
+    """
+    _, first, inverse = np.unique(_row_keys(states), return_index=True, return_inverse=True)
+    merged_amounts_paths = np.zeros(len(first), dtype=np.int64)
+    np.add.at(merged_amounts_paths, inverse.ravel(), amounts_paths)
+    return states[first], merged_amounts_paths, first
+
+
+class SearchAlgorithmBatch(SearchAlgorithm):
+    """ Breadth first search that expands a whole layer with one GenerateNeighborsBatch.expand
+
+    The repeated states of a layer are merged adding their amounts of paths, so
+    find_all_solutions counts every path to a goal state when all the paths to a state have the
+    same length, like in Senku. With a visited mode other than VisitedModeNone the states of the
+    earlier layers are removed too and it counts the shortest paths. With beam_width only the
+    beam_width states of lowest heuristic_array are kept in each layer, then the counts and the
+    shortest solutions are not guaranteed. Listed goal states, like a GoalSet, are compared with
+    the layers as arrays, other containers like a GoalPredicate are checked state by state with
+    GenerateNeighborsBatch.from_array, which is slower. An interrupted search starts over,
+    frontier_remove_repeated is not used
+    """
+    @staticmethod
+    def find_all_solutions(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighborsBatch],
+            debug_mode: DebugMode,
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            beam_width: int = 0
+    ) -> int:
+        def count_solutions(roots: List[Node]) -> int:
+            SearchAlgorithmBatch._search(
+                generate_neighbors, debug_mode, roots, goal_states, visited_mode is not VisitedModeNone,
+                beam_width, False)
+            # The solutions of each layer are added to the debug mode as it is searched
+            return 0
+        return SearchAlgorithm._find_all_solutions_from_roots(
+            frontier_mode, debug_mode, initial_state, count_solutions)
+
+    @staticmethod
+    def find_solution(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighborsBatch],
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            beam_width: int = 0
+    ) -> Solution:
+        _, goal_node = SearchAlgorithmBatch._search(
+            generate_neighbors, None, [Node(initial_state)], goal_states,
+            visited_mode is not VisitedModeNone, beam_width, True)
+        return SearchAlgorithm._solution_from_node(generate_neighbors, goal_node)
+
+    @staticmethod
+    def _search(
+            generate_neighbors: Type[GenerateNeighborsBatch],
+            debug_mode: Union[DebugMode, None],
+            roots: List[Node],
+            goal_states: Collection[State],
+            remove_visited: bool,
+            beam_width: int,
+            stop_at_first: bool
+    ) -> Tuple[int, Union[Node, None]]:
+        """ :return: the amount of solutions and, if stop_at_first, the goal node of the first one """
+        layer, amounts_paths, layer_roots = _merge(
+            generate_neighbors.to_array([root.state for root in roots]), np.ones(len(roots), dtype=np.int64))
+        if isinstance(goal_states, ListedCollection):
+            goal_keys = _row_keys(generate_neighbors.to_array(list(goal_states)))
+        else:
+            goal_keys = None
+        visited_keys = _row_keys(layer[:0])
+        # States, parents and moves of each layer after the first, to rebuild the path
+        history: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        amount_solutions = 0
+        while len(layer):
+            if goal_keys is not None:
+                is_goal = np.isin(_row_keys(layer), goal_keys)
+            else:
+                layer_states = generate_neighbors.from_array(layer)
+                is_goal = np.fromiter((state in goal_states for state in layer_states), dtype=bool,
+                                      count=len(layer))
+            amount_solutions_layer = int(amounts_paths[is_goal].sum())
+            if debug_mode is not None:
+                debug_mode.add_statistics(amount_solutions_layer, len(layer), len(layer))
+                if debug_mode.is_stop():
+                    return 0, None
+            amount_solutions += amount_solutions_layer
+            if stop_at_first and amount_solutions:
+                return amount_solutions, SearchAlgorithmBatch._goal_node(
+                    generate_neighbors, roots, layer_roots, history, np.flatnonzero(is_goal)[0])
+            expanded = np.flatnonzero(~is_goal)
+            neighbors, parents, moves = generate_neighbors.expand(layer[expanded])
+            parents = expanded[parents]
+            if remove_visited:
+                visited_keys = np.union1d(visited_keys, _row_keys(layer))
+                not_visited = ~np.isin(_row_keys(neighbors), visited_keys)
+                neighbors, parents, moves = neighbors[not_visited], parents[not_visited], moves[not_visited]
+            neighbors, neighbors_amounts_paths, first = _merge(neighbors, amounts_paths[parents])
+            parents, moves = parents[first], moves[first]
+            if beam_width and len(neighbors) > beam_width:
+                best = np.argsort(generate_neighbors.heuristic_array(neighbors), kind='stable')[:beam_width]
+                neighbors, neighbors_amounts_paths = neighbors[best], neighbors_amounts_paths[best]
+                parents, moves = parents[best], moves[best]
+            if stop_at_first:
+                history.append((neighbors, parents, moves))
+            layer, amounts_paths = neighbors, neighbors_amounts_paths
+        return amount_solutions, None
+
+    @staticmethod
+    def _goal_node(
+            generate_neighbors: Type[GenerateNeighborsBatch],
+            roots: List[Node],
+            layer_roots: np.ndarray,
+            history: List[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+            index: int
+    ) -> Node:
+        """ Node of the state at index in the last layer, with its ancestors rebuilt from history
+
+        :param layer_roots: the index in roots of each state of the first layer
+        """
+        indexes = [index]
+        for _, parents, _ in reversed(history):
+            index = parents[index]
+            indexes.append(index)
+        indexes.reverse()
+        node = roots[layer_roots[indexes[0]]]
+        for (states, _, moves), index in zip(history, indexes[1:]):
+            state = generate_neighbors.from_array(states[index:index + 1])[0]
+            node = Node(state, node, moves[index].item(), node.cost + 1)
+        return node
@@ -0,0 +1,137 @@
+from typing import Collection, Type, List, Tuple, Union, Dict, Hashable, Callable
+
+from .Structures import State, Solution, Node
+from .GenerateNeighbors import GenerateNeighbors
+from .FrontierMode import FrontierMode
+from .VisitedMode import VisitedMode
+from .DebugMode import DebugMode
+from .SearchAlgorithm import SearchAlgorithm
+
+# [node, amount of shortest paths to it, depth]
+Reached = Dict[Hashable, list]
+
+
+class SearchAlgorithmBidirectional(SearchAlgorithm):
+    """ Breadth first search forward from the initial state and backward from the goal states,
+    with GenerateNeighbors.generate_predecessors, until they meet
+
+    The smaller layer is expanded each time, so for a branching factor b and a solution of d
+    moves about 2·b^(d/2) states are expanded instead of b^d. The moves must have the same cost,
+    the solutions found are the shortest. The states must implement State.key and the goal states
+    must be listed, like in a GoalSet. find_all_solutions counts the shortest solutions with the
+    amount of shortest paths to each state of both searches, an interrupted search starts over.
+    The visited mode and frontier_remove_repeated are not used
+    """
+    @staticmethod
+    def find_all_solutions(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            debug_mode: DebugMode,
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State]
+    ) -> int:
+        return SearchAlgorithm._find_all_solutions_from_roots(
+            frontier_mode, debug_mode, initial_state,
+            lambda roots: SearchAlgorithmBidirectional._search(
+                generate_neighbors, debug_mode, roots, goal_states)[0])
+
+    @staticmethod
+    def find_solution(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State]
+    ) -> Solution:
+        _, goal_node = SearchAlgorithmBidirectional._search(
+            generate_neighbors, None, [Node(initial_state)], goal_states)
+        return SearchAlgorithm._solution_from_node(generate_neighbors, goal_node)
+
+    @staticmethod
+    def _search(
+            generate_neighbors: Type[GenerateNeighbors],
+            debug_mode: Union[DebugMode, None],
+            roots: List[Node],
+            goal_states: Collection[State]
+    ) -> Tuple[int, Union[Node, None]]:
+        """ :return: the amount of shortest solutions and the goal node of one of them """
+        forward: Reached = {}
+        for root in roots:
+            entry = forward.setdefault(root.state.key(), [root, 0, 0])
+            entry[1] += 1
+        backward: Reached = {goal_state.key(): [Node(goal_state), 1, 0] for goal_state in goal_states}
+        meetings = [forward[key] for key in forward if key in backward]
+        if meetings:
+            return SearchAlgorithmBidirectional._splice(meetings, forward, backward)
+        forward_layer = list(forward.values())
+        backward_layer = list(backward.values())
+        depth = 0
+        while forward_layer and backward_layer:
+            depth += 1
+            if len(forward_layer) <= len(backward_layer):
+                amount_nodes_visited = len(forward_layer)
+                forward_layer = SearchAlgorithmBidirectional._expand_layer(
+                    generate_neighbors.generate_neighbors, forward_layer, forward, depth)
+                meetings = [entry for entry in forward_layer if entry[0].state.key() in backward]
+            else:
+                amount_nodes_visited = len(backward_layer)
+                backward_layer = SearchAlgorithmBidirectional._expand_layer(
+                    generate_neighbors.generate_predecessors, backward_layer, backward, depth)
+                meetings = [forward[entry[0].state.key()] for entry in backward_layer
+                            if entry[0].state.key() in forward]
+            if debug_mode is not None:
+                debug_mode.add_statistics(0, amount_nodes_visited, len(forward_layer) + len(backward_layer))
+                if debug_mode.is_stop():
+                    return 0, None
+            if meetings:
+                return SearchAlgorithmBidirectional._splice(meetings, forward, backward)
+        return 0, None
+
+    @staticmethod
+    def _expand_layer(
+            generate: Callable[[Node, Collection[Node], Collection[State]], List[Node]],
+            layer: List[list],
+            reached: Reached,
+            depth: int
+    ) -> List[list]:
+        """ Next layer of a search, adding to each new state the shortest paths of its parents """
+        next_layer = []
+        for entry in layer:
+            for neighbor in generate(entry[0], (), reached):
+                key = neighbor.state.key()
+                neighbor_entry = reached.get(key)
+                if neighbor_entry is None:
+                    neighbor_entry = reached[key] = [neighbor, 0, depth]
+                    next_layer.append(neighbor_entry)
+                if neighbor_entry[2] == depth:
+                    neighbor_entry[1] += entry[1]
+        return next_layer
+
+    @staticmethod
+    def _splice(meetings: List[list], forward: Reached, backward: Reached) -> Tuple[int, Node]:
+        """ Join the searches at the meeting states with the shortest total depth, continuing the
+        forward node of one of them with the backward nodes up to their goal state
+
+        :param meetings: the forward entries of the states reached by both searches in the last layer
+        """
+        best_depth = None
+        amount_solutions = 0
+        best_entry = None
+        for entry in meetings:
+            backward_entry = backward[entry[0].state.key()]
+            depth = entry[2] + backward_entry[2]
+            if best_depth is None or depth < best_depth:
+                best_depth, amount_solutions, best_entry = depth, 0, entry
+            if depth == best_depth:
+                amount_solutions += entry[1] * backward_entry[1]
+        # The moves of the backward nodes go towards their parents
+        node = best_entry[0]
+        backward_node = backward[best_entry[0].state.key()][0]
+        while backward_node.parent is not None:
+            node = Node(backward_node.parent.state, node, backward_node.move,
+                        node.cost + backward_node.cost - backward_node.parent.cost)
+            backward_node = backward_node.parent
+        return amount_solutions, node
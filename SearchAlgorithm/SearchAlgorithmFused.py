@@ -0,0 +1,239 @@
+import asyncio
+import time
+from typing import Collection, Type, Callable, Tuple, Union, Iterator, AsyncIterator, List
+
+from .Structures import State, Solution, Node
+from .CancelToken import CancelToken
+from .GenerateNeighbors import GenerateNeighbors
+from .FrontierMode import FrontierMode
+from .VisitedMode import VisitedMode
+from .DebugMode import DebugMode
+from .SearchAlgorithm import SearchAlgorithm
+from .PruningRule import Pruner
+
+# amount of nodes visited, amount of solutions, frontier max size and the goal node if it stopped at one
+BatchResult = Tuple[int, int, int, Union[Node, None]]
+
+
+class SearchAlgorithmFused(SearchAlgorithm):
+    """ Same search as SearchAlgorithmIterative, but the loop is built once for the configuration
+
+    build_loop binds the methods of the modes to the frontier and the visited states and keeps
+    them as locals, so an iteration has no mode dispatch and no PartialSolution. The loop runs
+    batch_size nodes at a time and the debug mode is updated between batches with the counters
+    of the batch, so the statistics, the checkpoints, the metrics exports and the exit key are
+    checked every batch_size nodes. The phases of the metrics are not timed
+    """
+    @staticmethod
+    def build_loop(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            frontier_remove_repeated: bool,
+            frontier: Collection[Node],
+            visited_states: Collection[State],
+            goal_states: Collection[State],
+            stop_at_first: bool,
+            pruner: Pruner = None
+    ) -> Callable[[int], BatchResult]:
+        """ Loop that visits up to the given amount of nodes and returns the counters of the batch
+
+        It stops early when the frontier is empty, or at the first goal node with stop_at_first
+        """
+        select_node = frontier_mode.bind_select_node(frontier)
+        add_neighbors_to_frontier = frontier_mode.bind_add_neighbors_to_frontier(frontier)
+        add_visited = visited_mode.bind_add_visited(visited_states)
+        is_goal = goal_states.__contains__
+        contains_state = is_visited = None
+        if frontier_remove_repeated:
+            contains_state = frontier_mode.bind_contains_state(frontier)
+            is_visited = visited_mode.bind_is_visited(visited_states)
+        prune = order_neighbors = None
+        if pruner is not None:
+            prune = pruner.prune
+            order_neighbors = pruner.order_neighbors
+        lazy = frontier_mode.lazy
+        if lazy:
+            expand = generate_neighbors.iterate_neighbors
+        else:
+            expand = generate_neighbors.generate_neighbors
+
+        def loop(max_nodes_visited: int) -> BatchResult:
+            amount_nodes_visited = 0
+            amount_solutions = 0
+            max_size_frontier = 0
+            while amount_nodes_visited < max_nodes_visited and frontier:
+                actual_node = select_node()
+                amount_nodes_visited += 1
+                if is_goal(actual_node.state):
+                    amount_solutions += 1
+                    if stop_at_first:
+                        max_size_frontier = max(max_size_frontier, len(frontier))
+                        return amount_nodes_visited, amount_solutions, max_size_frontier, actual_node
+                else:
+                    if add_visited is not None:
+                        add_visited(actual_node.state)
+                    if prune is not None and prune(actual_node):
+                        continue
+                    neighbors = expand(actual_node, frontier, visited_states)
+                    if contains_state is not None:
+                        if lazy:
+                            neighbors = (neighbor for neighbor in neighbors
+                                         if not contains_state(neighbor.state) and
+                                         (is_visited is None or not is_visited(neighbor.state)))
+                        elif is_visited is None:
+                            neighbors = [neighbor for neighbor in neighbors
+                                         if not contains_state(neighbor.state)]
+                        else:
+                            neighbors = [neighbor for neighbor in neighbors
+                                         if not contains_state(neighbor.state) and
+                                         not is_visited(neighbor.state)]
+                    if order_neighbors is not None and not lazy:
+                        neighbors = order_neighbors(neighbors)
+                    add_neighbors_to_frontier(neighbors)
+                size_frontier = len(frontier)
+                if size_frontier > max_size_frontier:
+                    max_size_frontier = size_frontier
+            return amount_nodes_visited, amount_solutions, max_size_frontier, None
+
+        return loop
+
+    @staticmethod
+    def find_all_solutions(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            debug_mode: DebugMode,
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            batch_size: int = 10000,
+            pruner: Pruner = None
+    ) -> int:
+        frontier = debug_mode.initialization(initial_state, frontier_mode)
+        visited_states = visited_mode.create_visited()
+        loop = SearchAlgorithmFused.build_loop(
+            frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
+            frontier, visited_states, goal_states, False, pruner)
+        metrics = debug_mode.metrics
+        while frontier and not debug_mode.is_stop():
+            amount_nodes_visited, amount_solutions, max_size_frontier, _ = loop(batch_size)
+            debug_mode.add_statistics(amount_solutions, amount_nodes_visited, max_size_frontier)
+            if metrics is not None and metrics.is_export_due():
+                debug_mode.export_metrics(len(frontier))
+            if debug_mode.is_checkpoint_due():
+                debug_mode.save(frontier)
+        return debug_mode.finalization(frontier)
+
+    @staticmethod
+    def find_solution(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            batch_size: int = 10000,
+            pruner: Pruner = None
+    ) -> Solution:
+        frontier_mode.check_keeps_paths()
+        frontier = frontier_mode.load_frontier([Node(initial_state)])
+        visited_states = visited_mode.create_visited()
+        loop = SearchAlgorithmFused.build_loop(
+            frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
+            frontier, visited_states, goal_states, True, pruner)
+        goal_node = None
+        while goal_node is None and frontier:
+            goal_node = loop(batch_size)[3]
+        return SearchAlgorithm._solution_from_node(generate_neighbors, goal_node)
+
+    @staticmethod
+    def iterate_solutions(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            max_nodes_visited: int = 0,
+            max_secs: float = 0,
+            max_solutions: int = 0,
+            cancel_token: CancelToken = None,
+            batch_size: int = 1000
+    ) -> Iterator[List[str]]:
+        """ Yield the path of each solution when it is found, in the order of find_solution
+
+        The search ends when it visited max_nodes_visited nodes, after max_secs seconds, after
+        max_solutions solutions (0 for no limit) or when cancel_token is cancelled. The time and
+        the token are checked every batch_size nodes and when a solution is yielded
+        """
+        for path in SearchAlgorithmFused._iterate_batches(
+                frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated, initial_state,
+                goal_states, max_nodes_visited, max_secs, max_solutions, cancel_token, batch_size):
+            if path is not None:
+                yield path
+
+    @staticmethod
+    async def aiterate_solutions(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            max_nodes_visited: int = 0,
+            max_secs: float = 0,
+            max_solutions: int = 0,
+            cancel_token: CancelToken = None,
+            batch_size: int = 1000
+    ) -> AsyncIterator[List[str]]:
+        """ iterate_solutions as an async iterator, it lets other tasks run every batch_size nodes """
+        for path in SearchAlgorithmFused._iterate_batches(
+                frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated, initial_state,
+                goal_states, max_nodes_visited, max_secs, max_solutions, cancel_token, batch_size):
+            if path is None:
+                await asyncio.sleep(0)
+            else:
+                yield path
+
+    @staticmethod
+    def _iterate_batches(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            max_nodes_visited: int,
+            max_secs: float,
+            max_solutions: int,
+            cancel_token: Union[CancelToken, None],
+            batch_size: int
+    ) -> Iterator[Union[List[str], None]]:
+        """ Yield the path of each solution, and None after each batch without solution """
+        frontier_mode.check_keeps_paths()
+        frontier = frontier_mode.load_frontier([Node(initial_state)])
+        visited_states = visited_mode.create_visited()
+        loop = SearchAlgorithmFused.build_loop(
+            frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
+            frontier, visited_states, goal_states, True)
+        end_time = time.perf_counter() + max_secs if max_secs else None
+        amount_nodes_visited = 0
+        amount_solutions = 0
+        while frontier and (cancel_token is None or not cancel_token.is_cancelled()) and \
+                (end_time is None or time.perf_counter() < end_time):
+            if max_nodes_visited:
+                if amount_nodes_visited >= max_nodes_visited:
+                    return
+                amount_nodes_visited_batch, _, _, goal_node = loop(
+                    min(batch_size, max_nodes_visited - amount_nodes_visited))
+            else:
+                amount_nodes_visited_batch, _, _, goal_node = loop(batch_size)
+            amount_nodes_visited += amount_nodes_visited_batch
+            if goal_node is None:
+                yield None
+            else:
+                yield SearchAlgorithm._solution_from_node(generate_neighbors, goal_node).path
+                amount_solutions += 1
+                if amount_solutions == max_solutions:
+                    return
@@ -0,0 +1,161 @@
+import operator
+from typing import Collection, Type, List, Tuple, Union, Callable
+
+from .Structures import State, Solution, Node, LRUCache
+from .GenerateNeighbors import GenerateNeighbors
+from .FrontierMode import FrontierMode
+from .VisitedMode import VisitedMode
+from .DebugMode import DebugMode
+from .SearchAlgorithm import SearchAlgorithm
+
+Heuristic = Callable[[State], int]
+
+
+class SearchAlgorithmIterativeDeepening(SearchAlgorithm):
+    """ Depth first searches bounded by Node.cost, with the bound raised to the lowest cost that
+    exceeded it until a goal is found, so the first solution found has the minimum cost and the
+    memory is O(depth)
+
+    With a heuristic the bound is on cost + heuristic (IDA*), it must never overestimate to keep
+    the solutions optimal. With transposition_table_size the lowest cost each state was expanded
+    at is kept for that many recently expanded states (keyed by State.key) and the states reached
+    again at a higher cost are not expanded. find_all_solutions counts the solutions of minimum
+    cost, an interrupted search starts over from the first bound. The visited mode and
+    frontier_remove_repeated are not used
+    """
+    use_heuristic: bool = False
+
+    @classmethod
+    def find_all_solutions(
+            cls,
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            debug_mode: DebugMode,
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            heuristic: Heuristic = None,
+            transposition_table_size: int = 0
+    ) -> int:
+        return SearchAlgorithm._find_all_solutions_from_roots(
+            frontier_mode, debug_mode, initial_state,
+            lambda roots: cls._deepening(generate_neighbors, debug_mode, roots, goal_states,
+                                         cls._heuristic(heuristic), transposition_table_size, False)[0])
+
+    @classmethod
+    def find_solution(
+            cls,
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            heuristic: Heuristic = None,
+            transposition_table_size: int = 0
+    ) -> Solution:
+        _, solution_node = cls._deepening(
+            generate_neighbors, None, [Node(initial_state)], goal_states, cls._heuristic(heuristic),
+            transposition_table_size, True)
+        return SearchAlgorithm._solution_from_node(generate_neighbors, solution_node)
+
+    @classmethod
+    def _heuristic(cls, heuristic: Union[Heuristic, None]) -> Union[Heuristic, None]:
+        if heuristic is None and cls.use_heuristic:
+            return operator.methodcaller('heuristic')
+        return heuristic
+
+    @staticmethod
+    def _deepening(
+            generate_neighbors: Type[GenerateNeighbors],
+            debug_mode: Union[DebugMode, None],
+            roots: List[Node],
+            goal_states: Collection[State],
+            heuristic: Union[Heuristic, None],
+            transposition_table_size: int,
+            stop_at_first: bool
+    ) -> Tuple[int, Union[Node, None]]:
+        """ Raise the bound until a bounded search finds a goal or nothing exceeds the bound
+
+        :return: the amount of solutions of minimum cost and, if stop_at_first, the first one
+        """
+        table = LRUCache(transposition_table_size) if transposition_table_size else None
+        bound = min(root.cost + heuristic(root.state) if heuristic else root.cost for root in roots) \
+            if roots else 0
+        while roots:
+            amount_solutions, solution_node, next_bound = SearchAlgorithmIterativeDeepening._bounded_search(
+                generate_neighbors, debug_mode, roots, goal_states, heuristic, table, bound, stop_at_first)
+            if amount_solutions or next_bound is None or debug_mode is not None and debug_mode.is_stop():
+                return amount_solutions, solution_node
+            bound = next_bound
+        return 0, None
+
+    @staticmethod
+    def _bounded_search(
+            generate_neighbors: Type[GenerateNeighbors],
+            debug_mode: Union[DebugMode, None],
+            roots: List[Node],
+            goal_states: Collection[State],
+            heuristic: Union[Heuristic, None],
+            table: Union[LRUCache, None],
+            bound: int,
+            stop_at_first: bool,
+            batch_size: int = 10000
+    ) -> Tuple[int, Union[Node, None], Union[int, None]]:
+        """ Depth first search of the nodes within bound, with a stack of neighbor iterators
+
+        :return: the amount of solutions of minimum cost, the first one if stop_at_first and
+            the lowest cost that exceeded the bound, None if none did
+        """
+        amount_solutions = 0
+        solution_cost = None
+        next_bound = None
+        amount_nodes_visited = 0
+        max_depth = 0
+        stack = [iter(roots)]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                continue
+            cost = node.cost + heuristic(node.state) if heuristic else node.cost
+            if cost > bound:
+                if next_bound is None or cost < next_bound:
+                    next_bound = cost
+                continue
+            amount_nodes_visited += 1
+            if debug_mode is not None and amount_nodes_visited == batch_size:
+                debug_mode.add_statistics(0, amount_nodes_visited, max_depth)
+                amount_nodes_visited = 0
+                if debug_mode.is_stop():
+                    return 0, None, None
+            if SearchAlgorithm.is_goal(node.state, goal_states):
+                if stop_at_first:
+                    return 1, node, None
+                if solution_cost is None or node.cost < solution_cost:
+                    solution_cost = node.cost
+                    amount_solutions = 1
+                elif node.cost == solution_cost:
+                    amount_solutions += 1
+                continue
+            if table is not None:
+                # A state reached again at a higher cost is not in an optimal path. Reached at
+                # the same cost in the same bound it was already explored without solution
+                key = node.state.key()
+                expanded = table.get(key)
+                if expanded is not None and \
+                        (expanded[0] < node.cost or stop_at_first and expanded == (node.cost, bound)):
+                    continue
+                table[key] = (node.cost, bound)
+            stack.append(generate_neighbors.iterate_neighbors(node, stack, ()))
+            if len(stack) > max_depth:
+                max_depth = len(stack)
+        if debug_mode is not None:
+            debug_mode.add_statistics(0, amount_nodes_visited, max_depth)
+        return amount_solutions, None, next_bound
+
+
+class SearchAlgorithmIDAStar(SearchAlgorithmIterativeDeepening):
+    """ Iterative deepening on cost + State.heuristic, or the heuristic argument if given """
+    use_heuristic = True
@@ -0,0 +1,106 @@
+from typing import Collection, Type, List, Tuple, Union
+
+from .Structures import State, Solution, PartialSolution, Node, FoundSolution, LRUCache
+from .GenerateNeighbors import GenerateNeighbors
+from .FrontierMode import FrontierMode
+from .VisitedMode import VisitedMode
+from .DebugMode import DebugMode
+from .SearchAlgorithm import SearchAlgorithm
+
+
+class SearchAlgorithmMemoized(SearchAlgorithm):
+    """ Depth first search that remembers how many solutions there are from each state
+
+    For problems whose states form a DAG, like Senku, the amount of solutions of a state is the
+    sum of the amounts of its neighbors, so each state is expanded once while it stays in the
+    cache instead of once per path that reaches it. The cache keeps the cache_size most
+    recently used states, keyed by State.key, or by State.canonical_key with canonical (only
+    right if the goal states are closed under the symmetries). The states must not have cycles.
+    The frontier mode is only used to save and load the roots not counted yet with the debug mode,
+    the visited mode and frontier_remove_repeated are not used
+    """
+    @staticmethod
+    def find_all_solutions(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            debug_mode: DebugMode,
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            cache_size: int = 10000000,
+            canonical: bool = False
+    ) -> int:
+        roots = frontier_mode.drain_frontier(debug_mode.initialization(initial_state, frontier_mode))
+        cache = LRUCache(cache_size)
+        while roots and not debug_mode.is_stop():
+            amount_solutions, _ = SearchAlgorithmMemoized._count_solutions(
+                generate_neighbors, debug_mode, roots[-1], goal_states, cache, canonical, False)
+            if not debug_mode.is_stop():
+                roots.pop()
+                debug_mode.add_statistics(amount_solutions, 0, 0)
+                if debug_mode.is_checkpoint_due():
+                    debug_mode.save(frontier_mode.load_frontier(roots))
+        # The roots not finished are saved as the frontier, an interrupted root starts over
+        return debug_mode.finalization(frontier_mode.load_frontier(roots))
+
+    @staticmethod
+    def find_solution(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            cache_size: int = 10000000,
+            canonical: bool = False
+    ) -> Solution:
+        """ Depth first search that remembers the states without solution """
+        _, solution_node = SearchAlgorithmMemoized._count_solutions(
+            generate_neighbors, None, Node(initial_state), goal_states, LRUCache(cache_size), canonical, True)
+        return SearchAlgorithm._solution_from_node(generate_neighbors, solution_node)
+
+    @staticmethod
+    def _count_solutions(
+            generate_neighbors: Type[GenerateNeighbors],
+            debug_mode: Union[DebugMode, None],
+            initial_node: Node,
+            goal_states: Collection[State],
+            cache: LRUCache,
+            canonical: bool,
+            stop_at_first: bool
+    ) -> Tuple[int, Union[Node, None]]:
+        """ Amount of solutions from initial_node, computed in post order with an explicit stack
+
+        :return: the amount of solutions and, if stop_at_first, the first goal node found
+        """
+        # [node, key, neighbors not counted yet, amount of solutions of the counted ones]
+        stack: List[list] = []
+        node = initial_node
+        while True:
+            if SearchAlgorithm.is_goal(node.state, goal_states):
+                if stop_at_first:
+                    return 1, node
+                amount_node = 1
+            else:
+                key = node.state.canonical_key() if canonical else node.state.key()
+                amount_node = cache.get(key)
+                if amount_node is None:
+                    stack.append([node, key, generate_neighbors.iterate_neighbors(node, (), cache), 0])
+                    if debug_mode is not None:
+                        debug_mode.after_iteration(len(stack), PartialSolution(FoundSolution.NO_YET, None))
+            # Add the counted nodes to their parents until a parent has a neighbor left
+            node = None
+            while node is None:
+                if amount_node is not None:
+                    if not stack:
+                        return amount_node, None
+                    stack[-1][3] += amount_node
+                if debug_mode is not None and debug_mode.is_stop():
+                    return 0, None
+                entry = stack[-1]
+                node = next(entry[2], None)
+                if node is None:
+                    stack.pop()
+                    cache[entry[1]] = entry[3]
+                    amount_node = entry[3]
@@ -0,0 +1,256 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Collection, Type, List, Dict, Tuple, Union
+
+from .Structures import State, Solution, PartialSolution, Node, FoundSolution
+from .GenerateNeighbors import GenerateNeighbors
+from .FrontierMode import FrontierMode
+from .VisitedMode import VisitedMode
+from .DebugMode import DebugMode
+from .SearchAlgorithm import SearchAlgorithm
+
+# Configuration of the search in each worker process, set once by _init_worker
+_worker_config = None
+
+
+def _init_worker(
+        frontier_mode: Type[FrontierMode],
+        visited_mode: Type[VisitedMode],
+        generate_neighbors: Type[GenerateNeighbors],
+        frontier_remove_repeated: bool,
+        goal_states: Collection[State]
+):
+    global _worker_config
+    _worker_config = (frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated, goal_states)
+
+
+def _explore_subtrees(roots: List[Tuple[State, int]], node_budget: int, stop_at_first: bool)\
+        -> Tuple[int, int, int, List[tuple], Union[int, None], List[int]]:
+    """ Search from roots until node_budget nodes are visited
+
+    :param roots: the state and the cost of each root, without their parents
+    :return: amount of solutions, amount of nodes visited, max size of the frontier, the records
+        of _flatten, and the index of the first solution node if stop_at_first and of the nodes
+        left in the frontier
+    """
+    frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated, goal_states = _worker_config
+    root_nodes = [Node(state, cost=cost) for state, cost in roots]
+    frontier = frontier_mode.create_frontier()
+    frontier_mode.add_neighbors_to_frontier(frontier, root_nodes)
+    visited_states = visited_mode.create_visited()
+    amount_solutions = 0
+    amount_nodes_visited = 0
+    max_size_frontier = 0
+    while amount_nodes_visited < node_budget:
+        partial_solution = SearchAlgorithm._find_solution_iteration(
+            frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
+            frontier, visited_states, goal_states)
+        if partial_solution.found_solution == FoundSolution.NO:
+            break
+        amount_nodes_visited += 1
+        if len(frontier) > max_size_frontier:
+            max_size_frontier = len(frontier)
+        if partial_solution.found_solution == FoundSolution.YES:
+            amount_solutions += 1
+            if stop_at_first:
+                records, (solution_index,) = _flatten([partial_solution.node], root_nodes)
+                return amount_solutions, amount_nodes_visited, max_size_frontier, records, solution_index, []
+    remaining = frontier_mode.drain_frontier(frontier)
+    records, remaining_indexes = _flatten(remaining, root_nodes)
+    return amount_solutions, amount_nodes_visited, max_size_frontier, records, None, remaining_indexes
+
+
+def _flatten(nodes: List[Node], roots: List[Node]) -> Tuple[List[tuple], List[int]]:
+    """ The nodes and their ancestors below the roots as (parent index, move, state, cost)
+    records, parents before children and each node once, so they are pickled without recursing
+    along the parents. The roots are the first indexes and are not in the records
+
+    :return: the records and the index of each node
+    """
+    indexes: Dict[int, int] = {id(root): index for index, root in enumerate(roots)}
+    records = []
+    node_indexes = []
+    for node in nodes:
+        new_nodes = []
+        ancestor = node
+        while id(ancestor) not in indexes:
+            new_nodes.append(ancestor)
+            ancestor = ancestor.parent
+        for new_node in reversed(new_nodes):
+            records.append((indexes[id(new_node.parent)], new_node.move, new_node.state, new_node.cost))
+            indexes[id(new_node)] = len(indexes)
+        node_indexes.append(indexes[id(node)])
+    return records, node_indexes
+
+
+def _unflatten(records: List[tuple], roots: List[Node]) -> List[Node]:
+    """ Inverse of _flatten, the nodes of all the indexes with the roots as the first ones """
+    nodes = list(roots)
+    for parent_index, move, state, cost in records:
+        nodes.append(Node(state, nodes[parent_index], move, cost))
+    return nodes
+
+
+class SearchAlgorithmParallel(SearchAlgorithm):
+    """ Split the search tree in subtrees and search them in a pool of processes
+
+    The tree is expanded in this process until the frontier has tasks_per_worker nodes per
+    worker, each node is the root of an independent subtree. A task searches its subtrees
+    for node_budget nodes and sends back the nodes it did not explore, which are split again
+    in new tasks when there are few tasks queued, so the workers stay busy until the end.
+    Every task has its own visited states, repeated states in different subtrees are not
+    detected. Only the states of the roots are sent to the workers and the nodes sent back are
+    flattened, so the paths are not pickled. The modes, the generate_neighbors and the states
+    must be picklable
+    """
+    @staticmethod
+    def find_all_solutions(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            debug_mode: DebugMode,
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            workers: int = None,
+            node_budget: int = 100000,
+            tasks_per_worker: int = 4
+    ) -> int:
+        frontier = debug_mode.initialization(initial_state, frontier_mode)
+        workers = workers or os.cpu_count()
+        roots = SearchAlgorithmParallel._split_near_root(
+            frontier_mode, visited_mode, generate_neighbors, debug_mode, frontier_remove_repeated,
+            frontier, goal_states, workers * tasks_per_worker)
+        with ProcessPoolExecutor(
+                workers, initializer=_init_worker,
+                initargs=(frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
+                          goal_states)) as executor:
+            tasks: Dict[Future, List[Node]] = {}
+            SearchAlgorithmParallel._submit(
+                executor, tasks, roots, node_budget, False, workers * tasks_per_worker)
+            while tasks and not debug_mode.is_stop():
+                done, _ = wait(tasks, timeout=1, return_when=FIRST_COMPLETED)
+                for task in done:
+                    task_roots = tasks.pop(task)
+                    amount_solutions, amount_nodes_visited, max_size_frontier, _, remaining = \
+                        SearchAlgorithmParallel._result(task, task_roots)
+                    debug_mode.add_statistics(amount_solutions, amount_nodes_visited, max_size_frontier)
+                    SearchAlgorithmParallel._submit(
+                        executor, tasks, remaining, node_budget, False, workers * tasks_per_worker)
+                if debug_mode.is_checkpoint_due():
+                    # The statistics have the results of the finished tasks only, so the roots of
+                    # the tasks not finished are the frontier
+                    debug_mode.save(frontier_mode.load_frontier(
+                        [root for roots in tasks.values() for root in roots]))
+            # Stopped by the user, the subtrees not finished are saved as the frontier
+            remaining = []
+            for task, task_roots in tasks.items():
+                if task.cancel():
+                    remaining.extend(task_roots)
+                else:
+                    amount_solutions, amount_nodes_visited, max_size_frontier, _, task_remaining = \
+                        SearchAlgorithmParallel._result(task, task_roots)
+                    debug_mode.add_statistics(amount_solutions, amount_nodes_visited, max_size_frontier)
+                    remaining.extend(task_remaining)
+        return debug_mode.finalization(frontier_mode.load_frontier(remaining))
+
+    @staticmethod
+    def find_solution(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            frontier_remove_repeated: bool,
+            initial_state: State,
+            goal_states: Collection[State],
+            workers: int = None,
+            node_budget: int = 100000,
+            tasks_per_worker: int = 4
+    ) -> Solution:
+        frontier_mode.check_keeps_paths()
+        workers = workers or os.cpu_count()
+        frontier = frontier_mode.create_frontier()
+        frontier_mode.add_neighbors_to_frontier(frontier, [Node(initial_state)])
+        visited_states = visited_mode.create_visited()
+        partial_solution = PartialSolution(FoundSolution.NO_YET, None)
+        while partial_solution.found_solution == FoundSolution.NO_YET and \
+                len(frontier) < workers * tasks_per_worker:
+            partial_solution = SearchAlgorithm._find_solution_iteration(
+                frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
+                frontier, visited_states, goal_states)
+        solution_node = partial_solution.node
+        if partial_solution.found_solution == FoundSolution.NO_YET:
+            roots = frontier_mode.drain_frontier(frontier)
+            with ProcessPoolExecutor(
+                    workers, initializer=_init_worker,
+                    initargs=(frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
+                              goal_states)) as executor:
+                tasks: Dict[Future, List[Node]] = {}
+                SearchAlgorithmParallel._submit(
+                    executor, tasks, roots, node_budget, True, workers * tasks_per_worker)
+                while tasks and solution_node is None:
+                    done, _ = wait(tasks, return_when=FIRST_COMPLETED)
+                    for task in done:
+                        _, _, _, task_solution_node, remaining = SearchAlgorithmParallel._result(
+                            task, tasks.pop(task))
+                        if task_solution_node is not None:
+                            solution_node = task_solution_node
+                            break
+                        SearchAlgorithmParallel._submit(
+                            executor, tasks, remaining, node_budget, True, workers * tasks_per_worker)
+                for task in tasks:
+                    task.cancel()
+        return SearchAlgorithm._solution_from_node(generate_neighbors, solution_node)
+
+    @staticmethod
+    def _split_near_root(
+            frontier_mode: Type[FrontierMode],
+            visited_mode: Type[VisitedMode],
+            generate_neighbors: Type[GenerateNeighbors],
+            debug_mode: DebugMode,
+            frontier_remove_repeated: bool,
+            frontier: Collection[Node],
+            goal_states: Collection[State],
+            amount_roots: int
+    ) -> List[Node]:
+        visited_states = visited_mode.create_visited()
+        partial_solution = PartialSolution(FoundSolution.NO_YET, None)
+        while 0 < len(frontier) < amount_roots and not debug_mode.is_stop() and \
+                partial_solution.found_solution != FoundSolution.NO:
+            partial_solution = SearchAlgorithm._find_solution_iteration(
+                frontier_mode, visited_mode, generate_neighbors, frontier_remove_repeated,
+                frontier, visited_states, goal_states)
+            debug_mode.after_iteration(len(frontier), partial_solution)
+        return frontier_mode.drain_frontier(frontier)
+
+    @staticmethod
+    def _submit(
+            executor: ProcessPoolExecutor,
+            tasks: Dict[Future, List[Node]],
+            roots: List[Node],
+            node_budget: int,
+            stop_at_first: bool,
+            min_tasks: int
+    ) -> None:
+        """ Submit roots as one task, or split them in the tasks missing to reach min_tasks """
+        if not roots:
+            return
+        amount_groups = max(1, min(len(roots), min_tasks - len(tasks)))
+        for index in range(amount_groups):
+            group = roots[index::amount_groups]
+            # Only the states are sent, the paths to the roots stay in this process
+            detached_group = [(root.state, root.cost) for root in group]
+            tasks[executor.submit(_explore_subtrees, detached_group, node_budget, stop_at_first)] = group
+
+    @staticmethod
+    def _result(task: Future, roots: List[Node]) -> Tuple[int, int, int, Union[Node, None], List[Node]]:
+        """ The result of a finished task with its nodes joined to the roots it was sent
+
+        :return: amount of solutions, amount of nodes visited, max size of the frontier, the
+            solution node if one was found with stop_at_first, and the nodes left in the frontier
+        """
+        (amount_solutions, amount_nodes_visited, max_size_frontier, records, solution_index,
+         remaining_indexes) = task.result()
+        nodes = _unflatten(records, roots)
+        solution_node = nodes[solution_index] if solution_index is not None else None
+        return (amount_solutions, amount_nodes_visited, max_size_frontier, solution_node,
+                [nodes[index] for index in remaining_indexes])
@@ -1,23 +1,124 @@
 import abc
+from collections import OrderedDict
 from enum import Enum, auto
-from typing import NamedTuple, List, Union, TypeVar, Generic
+from typing import (NamedTuple, List, Union, TypeVar, Generic, Hashable, Iterable, Iterator, Callable,
+                    Collection, Container)
 
 
 class State(abc.ABC):
+    __slots__ = ()
+
     @abc.abstractmethod
     def __eq__(self, other):
         pass
 
+    def key(self) -> Hashable:
+        """ Fingerprint of the state, two states are equal if and only if their keys are equal
+
+        Needed by the hashed visited and frontier modes, they store and compare keys instead of
+        comparing states one by one
+        """
+        raise NotImplementedError('{} does not define a key'.format(type(self).__name__))
+
+    def canonical_key(self) -> Hashable:
+        """ Key shared by all the states that are equivalent under the symmetries of the problem
+
+        Used by the canonical visited and frontier modes to explore only one state of each
+        symmetry class. If the goal states are closed under the same symmetries, pruning a state
+        because a symmetric one was seen keeps finding a solution when there is one, but
+        find_all_solutions counts fewer solutions, the ones through the pruned states are lost.
+        To count them all use SearchAlgorithmMemoized with canonical, which adds the solutions of
+        the symmetric state instead of pruning it. By default the problem has no symmetries and
+        it is the key
+        """
+        return self.key()
+
+    def pack(self) -> bytes:
+        """ Compact binary encoding of the state, used by the checkpoints """
+        raise NotImplementedError('{} does not define pack'.format(type(self).__name__))
+
+    @classmethod
+    def unpack(cls, data: bytes) -> 'State':
+        """ Inverse of pack """
+        raise NotImplementedError('{} does not define unpack'.format(cls.__name__))
+
+    def heuristic(self) -> int:
+        """ Estimated cost from this state to a goal state, used by the greedy and A* frontier
+        modes. A* only returns optimal solutions if it never overestimates
+        """
+        return 0
+
+    def __hash__(self):
+        return hash(self.key())
+
 
 State_T = TypeVar('State_T', bound=State)
 
 
+class GoalSet(Collection[State_T]):
+    """ Goal states indexed by their key, checking if a state is a goal costs one key lookup
+    instead of one comparison per goal state
+    """
+    __slots__ = ('goals',)
+
+    def __init__(self, goal_states: Iterable[State_T]):
+        self.goals = {goal_state.key(): goal_state for goal_state in goal_states}
+
+    def __contains__(self, state) -> bool:
+        return state.key() in self.goals
+
+    def __iter__(self) -> Iterator[State_T]:
+        return iter(self.goals.values())
+
+    def __len__(self) -> int:
+        return len(self.goals)
+
+
+class GoalPredicate(Container[State_T]):
+    """ Goal states defined by a condition instead of listed one by one
+
+    The predicate must be a module level function for the parallel search, which sends the goal
+    states to the worker processes
+    """
+    __slots__ = ('predicate',)
+
+    def __init__(self, predicate: Callable[[State_T], bool]):
+        self.predicate = predicate
+
+    def __contains__(self, state) -> bool:
+        return self.predicate(state)
+
+
 class Node(Generic[State_T]):
-    def __init__(self, state: State_T, path: List[str], cost: int):
+    """ A state reached by applying move to the state of parent
+
+    The path is not stored, it is rebuilt following the parents when a solution is returned
+    """
+    __slots__ = ('state', 'parent', 'move', 'cost')
+
+    def __init__(
+            self,
+            state: State_T,
+            parent: 'Node[State_T]' = None,
+            move: Hashable = None,
+            cost: int = 0
+    ):
         self.state: State_T = state
-        self.path: List[str] = path
+        self.parent: Node[State_T] = parent
+        self.move: Hashable = move
         self.cost: int = cost
 
+    @property
+    def path(self) -> List[Hashable]:
+        """ Moves from the initial node to this one """
+        path = []
+        node = self
+        while node.parent is not None:
+            path.append(node.move)
+            node = node.parent
+        path.reverse()
+        return path
+
 
 class Solution(NamedTuple):
     has_solution: bool
@@ -32,4 +133,23 @@ class FoundSolution(Enum):
 
 class PartialSolution(NamedTuple):
     found_solution: FoundSolution
-    path: Union[List[str], None]
+    node: Union[Node, None]
+
+
+class LRUCache(OrderedDict):
+    """ Dict with at most max_size entries, when full the least recently used entry is evicted """
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.max_size = max_size
+
+    def get(self, key, default=None):
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        return default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.max_size:
+            self.popitem(last=False)
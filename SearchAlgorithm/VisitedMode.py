@@ -1,7 +1,9 @@
 import abc
-from typing import Collection, List
+import functools
+from typing import Collection, List, Set, Hashable, Callable, Union
 
 from .Structures import State
+from .BloomFilter import BloomFilter
 
 
 class VisitedMode(abc.ABC):
@@ -15,6 +17,20 @@ class VisitedMode(abc.ABC):
     def add_visited(visited_states: Collection[State], actual_state: State) -> None:
         pass
 
+    @staticmethod
+    def is_visited(visited_states: Collection[State], actual_state: State) -> bool:
+        return actual_state in visited_states
+
+    @classmethod
+    def bind_add_visited(cls, visited_states: Collection[State]) -> Union[Callable[[State], None], None]:
+        """ add_visited of visited_states, used by the fused search loop. None if it does nothing """
+        return functools.partial(cls.add_visited, visited_states)
+
+    @classmethod
+    def bind_is_visited(cls, visited_states: Collection[State]) -> Union[Callable[[State], bool], None]:
+        """ is_visited of visited_states, used by the fused search loop. None if it is always False """
+        return functools.partial(cls.is_visited, visited_states)
+
 
 class VisitedModeList(VisitedMode):
     @staticmethod
@@ -26,6 +42,72 @@ class VisitedModeList(VisitedMode):
         visited_states.append(actual_state)
 
 
+class VisitedModeSet(VisitedMode):
+    """ Keep the keys of the visited states in a set, the states must implement State.key """
+    @staticmethod
+    def create_visited() -> Set[Hashable]:
+        return set()
+
+    @staticmethod
+    def add_visited(visited_states: Set[Hashable], actual_state: State) -> None:
+        visited_states.add(actual_state.key())
+
+    @staticmethod
+    def is_visited(visited_states: Set[Hashable], actual_state: State) -> bool:
+        return actual_state.key() in visited_states
+
+
+class VisitedModeSetCanonical(VisitedMode):
+    """ Like VisitedModeSet but a state counts as visited if a symmetric one was visited. It
+    keeps the existence of solutions, not their amount, see State.canonical_key
+    """
+    @staticmethod
+    def create_visited() -> Set[Hashable]:
+        return set()
+
+    @staticmethod
+    def add_visited(visited_states: Set[Hashable], actual_state: State) -> None:
+        visited_states.add(actual_state.canonical_key())
+
+    @staticmethod
+    def is_visited(visited_states: Set[Hashable], actual_state: State) -> bool:
+        return actual_state.canonical_key() in visited_states
+
+
+class VisitedModeBloom(VisitedMode):
+    """ Keep the keys of the visited states in a BloomFilter, the states must implement State.key
+
+    A state that was not visited is taken as visited with a small probability, so some states are
+    wrongly pruned and solutions can be lost, in exchange for a fixed amount of memory. Subclass
+    it to set the filter: capacity states with false_positive_rate probability of pruning one
+    wrongly, or size_bytes of memory, in the file path if set. The file starts zeroed, set resume
+    to keep its bits when the search continues from a DebugMode checkpoint. The states visited
+    after that checkpoint stay in the filter, so they are pruned if they are reached again
+    """
+    capacity: int = 10000000
+    false_positive_rate: float = 0.01
+    size_bytes: int = None
+    path: str = None
+    resume: bool = False
+
+    @classmethod
+    def create_visited(cls) -> BloomFilter:
+        return BloomFilter(cls.capacity, cls.false_positive_rate, cls.size_bytes, cls.path, cls.resume)
+
+    @staticmethod
+    def add_visited(visited_states: BloomFilter, actual_state: State) -> None:
+        visited_states.add(actual_state.key())
+
+    @staticmethod
+    def is_visited(visited_states: BloomFilter, actual_state: State) -> bool:
+        return actual_state.key() in visited_states
+
+    @staticmethod
+    def expected_false_positive_rate(visited_states: BloomFilter) -> float:
+        """ Probability that a state not visited is taken as visited and pruned """
+        return visited_states.expected_false_positive_rate()
+
+
 class VisitedModeNone(VisitedMode):
     @staticmethod
     def create_visited() -> List:
@@ -34,3 +116,21 @@ class VisitedModeNone(VisitedMode):
     @staticmethod
     def add_visited(visited_states, actual_state):
         pass
+
+    @staticmethod
+    def is_visited(visited_states, actual_state):
+        return False
+
+    @staticmethod
+    def bind_add_visited(visited_states):
+        return None
+
+    @staticmethod
+    def bind_is_visited(visited_states):
+        return None
+
+
+class VisitedModeExternal(VisitedModeNone):
+    """ Visited mode of FrontierModeExternalBFS, the earlier layers it keeps on disk are the
+    visited states
+    """
@@ -1,11 +1,14 @@
-from typing import Container, List
+from typing import Container, List, Tuple, Dict, Type, Callable, Iterator, Union
 
 import numpy as np
 
-from SearchAlgorithm.Structures import State, Node
-from SearchAlgorithm.FrontierMode import FrontierModeDFS
+from SearchAlgorithm.Structures import State, Node, GoalSet
+from SearchAlgorithm.FrontierMode import FrontierModeDFS, FrontierModeExternalBFS
 from SearchAlgorithm.VisitedMode import VisitedModeNone
 from SearchAlgorithm.GenerateNeighbors import GenerateNeighbors
+from SearchAlgorithm.GenerateNeighborsBatch import GenerateNeighborsBatch
+from SearchAlgorithm.PruningRule import PruningRule
+from SearchAlgorithm.EndgameDatabase import EndgameDatabase, EndgameRule
 from SearchAlgorithm.DebugMode import DebugMode
 from SearchAlgorithm.SearchAlgorithm import SearchAlgorithmIterative
 
@@ -20,6 +23,25 @@ class SenkuState(State):
             return False
         return np.array_equal(self.board, other.board)
 
+    def key(self):
+        return self.cost, self.board.tobytes()
+
+    def pack(self):
+        rows, columns = self.board.shape
+        return bytes((self.cost, rows, columns)) + ''.join(self.board.flat).encode('ascii')
+
+    @classmethod
+    def unpack(cls, data):
+        board = np.array(list(data[3:].decode('ascii'))).reshape(data[1], data[2])
+        return cls(data[0], board)
+
+    def heuristic(self):
+        # Exact, see SenkuBitboardState
+        return np.count_nonzero(self.board == 'X') - 1
+
+    def __hash__(self):
+        return hash(self.key())
+
 
 class GenerateNeighborsSenku(GenerateNeighbors):
     @staticmethod
@@ -28,7 +50,14 @@ class GenerateNeighborsSenku(GenerateNeighbors):
             frontier: Container[Node[SenkuState]],
             visited_states: Container[SenkuState]
     ) -> List[Node[SenkuState]]:
-        neighbors = []
+        return list(GenerateNeighborsSenku.iterate_neighbors(actual_node, frontier, visited_states))
+
+    @staticmethod
+    def iterate_neighbors(
+            actual_node: Node[SenkuState],
+            frontier: Container[Node[SenkuState]],
+            visited_states: Container[SenkuState]
+    ) -> Iterator[Node[SenkuState]]:
         for row in range(len(actual_node.state.board)):
             for column in range(len(actual_node.state.board[row])):
                 if actual_node.state.board[row][column] == 'X':
@@ -39,10 +68,8 @@ class GenerateNeighborsSenku(GenerateNeighbors):
                         nuevo_estado.board[row][column] = '-'
                         nuevo_estado.board[row - 1][column] = '-'
                         nuevo_estado.board[row - 2][column] = 'X'
-                        nuevo_camino = actual_node.path[:]
-                        nuevo_camino.append('[{}-{}] a [{}-{}]'.
-                                            format(row, column, row - 2, column))
-                        neighbors.append(Node(nuevo_estado, nuevo_camino, actual_node.cost + 1))
+                        movimiento = GenerateNeighborsSenku.encode_move(row, column, row - 2, column)
+                        yield Node(nuevo_estado, actual_node, movimiento, actual_node.cost + 1)
                     if row + 2 < len(actual_node.state.board) and actual_node.state.board[row + 2][column] == '-' \
                             and actual_node.state.board[row + 1][column] == 'X':
                         # Comer a abajo
@@ -50,10 +77,8 @@ class GenerateNeighborsSenku(GenerateNeighbors):
                         nuevo_estado.board[row][column] = '-'
                         nuevo_estado.board[row + 1][column] = '-'
                         nuevo_estado.board[row + 2][column] = 'X'
-                        nuevo_camino = actual_node.path[:]
-                        nuevo_camino.append('[{}-{}] a [{}-{}]'
-                                            .format(row, column, row + 2, column))
-                        neighbors.append(Node(nuevo_estado, nuevo_camino, actual_node.cost + 1))
+                        movimiento = GenerateNeighborsSenku.encode_move(row, column, row + 2, column)
+                        yield Node(nuevo_estado, actual_node, movimiento, actual_node.cost + 1)
                     if column >= 2 and actual_node.state.board[row][column - 2] == '-' \
                             and actual_node.state.board[row][column - 1] == 'X':
                         # Comer a izquierda
@@ -61,10 +86,8 @@ class GenerateNeighborsSenku(GenerateNeighbors):
                         nuevo_estado.board[row][column] = '-'
                         nuevo_estado.board[row][column - 1] = '-'
                         nuevo_estado.board[row][column - 2] = 'X'
-                        nuevo_camino = actual_node.path[:]
-                        nuevo_camino.append('[{}-{}] a [{}-{}]'
-                                            .format(row, column, row, column - 2))
-                        neighbors.append(Node(nuevo_estado, nuevo_camino, actual_node.cost + 1))
+                        movimiento = GenerateNeighborsSenku.encode_move(row, column, row, column - 2)
+                        yield Node(nuevo_estado, actual_node, movimiento, actual_node.cost + 1)
                     if column + 2 < len(actual_node.state.board[row]) \
                             and actual_node.state.board[row][column + 2] == '-' \
                             and actual_node.state.board[row][column + 1] == 'X':
@@ -73,12 +96,452 @@ class GenerateNeighborsSenku(GenerateNeighbors):
                         nuevo_estado.board[row][column] = '-'
                         nuevo_estado.board[row][column + 1] = '-'
                         nuevo_estado.board[row][column + 2] = 'X'
-                        nuevo_camino = actual_node.path[:]
-                        nuevo_camino.append('[{}-{}] a [{}-{}]'
-                                            .format(row, column, row, column + 2))
-                        neighbors.append(Node(nuevo_estado, nuevo_camino, actual_node.cost + 1))
+                        movimiento = GenerateNeighborsSenku.encode_move(row, column, row, column + 2)
+                        yield Node(nuevo_estado, actual_node, movimiento, actual_node.cost + 1)
+
+    @staticmethod
+    def encode_move(row: int, column: int, to_row: int, to_column: int) -> int:
+        return row << 24 | column << 16 | to_row << 8 | to_column
+
+    @staticmethod
+    def describe_move(move: int) -> str:
+        return '[{}-{}] a [{}-{}]'.format(move >> 24, move >> 16 & 0xFF, move >> 8 & 0xFF, move & 0xFF)
+
+
+class SenkuBoard:
+    """ Geometry of a Senku board, numbers its holes and precomputes every jump as bit masks
+
+    :param template: 2D array with ' ' where the board has no hole
+    :param directions: (row, column) steps in which a peg can jump
+    """
+    def __init__(
+            self,
+            template: np.array,
+            directions: Tuple[Tuple[int, int], ...] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+    ):
+        self.template = template
+        self.holes: List[Tuple[int, int]] = [
+            (row, column)
+            for row in range(len(template)) for column in range(len(template[row]))
+            if template[row][column] != ' ']
+        self.bits: Dict[Tuple[int, int], int] = {hole: 1 << index for index, hole in enumerate(self.holes)}
+        # (from | over, to, from | over | to) for every jump, the move code of a jump is its index
+        self.jumps: List[Tuple[int, int, int]] = []
+        self.jump_descriptions: List[str] = []
+        for row, column in self.holes:
+            for row_step, column_step in directions:
+                over = (row + row_step, column + column_step)
+                to = (row + 2 * row_step, column + 2 * column_step)
+                if over in self.bits and to in self.bits:
+                    from_over = self.bits[(row, column)] | self.bits[over]
+                    self.jumps.append((from_over, self.bits[to], from_over | self.bits[to]))
+                    self.jump_descriptions.append('[{}-{}] a [{}-{}]'.format(row, column, to[0], to[1]))
+        # For every symmetry of the board, 256 entries tables that map each byte of the pegs
+        # to the transformed pegs, so a transformation costs one lookup per byte. The identity
+        # is left out, canonical starts from the untransformed pegs
+        self.symmetries: List[List[List[int]]] = []
+        for transform in self._dihedral_transforms(len(template), len(template[0]))[1:]:
+            origin = transform(0, 0)
+            if all(transform(*hole) in self.bits for hole in self.holes) and \
+                    all((transform(*step)[0] - origin[0], transform(*step)[1] - origin[1]) in directions
+                        for step in directions):
+                self.symmetries.append(self._byte_tables(transform))
+
+    @staticmethod
+    def _dihedral_transforms(rows: int, columns: int) -> List[Callable[[int, int], Tuple[int, int]]]:
+        transforms = [
+            lambda row, column: (row, column),
+            lambda row, column: (row, columns - 1 - column),
+            lambda row, column: (rows - 1 - row, column),
+            lambda row, column: (rows - 1 - row, columns - 1 - column),
+        ]
+        if rows == columns:
+            transforms += [
+                lambda row, column: (column, row),
+                lambda row, column: (column, rows - 1 - row),
+                lambda row, column: (rows - 1 - column, row),
+                lambda row, column: (rows - 1 - column, rows - 1 - row),
+            ]
+        return transforms
+
+    def _byte_tables(self, transform: Callable[[int, int], Tuple[int, int]]) -> List[List[int]]:
+        tables = []
+        for first_hole in range(0, len(self.holes), 8):
+            table = [0] * 256
+            for byte in range(256):
+                for offset in range(8):
+                    if byte >> offset & 1 and first_hole + offset < len(self.holes):
+                        table[byte] |= self.bits[transform(*self.holes[first_hole + offset])]
+            tables.append(table)
+        return tables
+
+    def canonical(self, pegs: int) -> int:
+        """ Smallest encoding among all the symmetric positions of pegs """
+        best = pegs
+        for tables in self.symmetries:
+            transformed = 0
+            shifted = pegs
+            for table in tables:
+                transformed |= table[shifted & 0xFF]
+                shifted >>= 8
+            if transformed < best:
+                best = transformed
+        return best
+
+    def encode(self, board: np.array) -> int:
+        pegs = 0
+        for hole, bit in self.bits.items():
+            if board[hole] == 'X':
+                pegs |= bit
+        return pegs
+
+    def encode_array(self, boards: np.ndarray) -> np.ndarray:
+        """ encode of every board of a (N, rows, columns) array, as a uint64 array """
+        pegs = np.zeros(len(boards), dtype=np.uint64)
+        for (row, column), bit in self.bits.items():
+            pegs |= np.where(boards[:, row, column] == 'X', np.uint64(bit), np.uint64(0))
+        return pegs
+
+    def decode(self, pegs: int) -> np.array:
+        board = self.template.copy()
+        for hole, bit in self.bits.items():
+            board[hole] = 'X' if pegs & bit else '-'
+        return board
+
+
+ENGLISH_BOARD = SenkuBoard(np.array([
+    [' ', ' ', '-', '-', '-', ' ', ' '],
+    [' ', ' ', '-', '-', '-', ' ', ' '],
+    ['-', '-', '-', '-', '-', '-', '-'],
+    ['-', '-', '-', '-', '-', '-', '-'],
+    ['-', '-', '-', '-', '-', '-', '-'],
+    [' ', ' ', '-', '-', '-', ' ', ' '],
+    [' ', ' ', '-', '-', '-', ' ', ' ']
+]))
+
+EUROPEAN_BOARD = SenkuBoard(np.array([
+    [' ', ' ', '-', '-', '-', ' ', ' '],
+    [' ', '-', '-', '-', '-', '-', ' '],
+    ['-', '-', '-', '-', '-', '-', '-'],
+    ['-', '-', '-', '-', '-', '-', '-'],
+    ['-', '-', '-', '-', '-', '-', '-'],
+    [' ', '-', '-', '-', '-', '-', ' '],
+    [' ', ' ', '-', '-', '-', ' ', ' ']
+]))
+
+# The rows of the triangle are left aligned, so the diagonal jumps are (1, 1) and (-1, -1)
+TRIANGULAR_BOARD = SenkuBoard(np.array([
+    ['-', ' ', ' ', ' ', ' '],
+    ['-', '-', ' ', ' ', ' '],
+    ['-', '-', '-', ' ', ' '],
+    ['-', '-', '-', '-', ' '],
+    ['-', '-', '-', '-', '-']
+]), directions=((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, 1)))
+
+
+class SenkuBitboardState(State):
+    """ Senku state with the pegs packed in an int, bit i is the i-th hole of board
+
+    Every jump removes one peg, so every game from a state with n pegs to its end has n - 1
+    moves. The heuristic is exact, and a state is only reached at one depth, so the layers of a
+    breadth first search never share states. Subclass it and set board to play in other boards
+    """
+    __slots__ = ('pegs',)
+    board: SenkuBoard = ENGLISH_BOARD
+
+    def __init__(self, pegs: int):
+        self.pegs = pegs
+
+    def __eq__(self, other):
+        return self.pegs == other.pegs
+
+    def key(self):
+        return self.pegs
+
+    def canonical_key(self):
+        return self.board.canonical(self.pegs)
+
+    def pack(self):
+        return self.pegs.to_bytes(8, 'big')
+
+    @classmethod
+    def unpack(cls, data):
+        return cls(int.from_bytes(data, 'big'))
+
+    def heuristic(self):
+        return bin(self.pegs).count('1') - 1
+
+    def __hash__(self):
+        return hash(self.pegs)
+
+    @classmethod
+    def from_senku_state(cls, state: SenkuState) -> 'SenkuBitboardState':
+        return cls(cls.board.encode(state.board))
+
+    def to_senku_state(self, cost: int) -> SenkuState:
+        return SenkuState(cost, self.board.decode(self.pegs))
+
+
+class GenerateNeighborsSenkuBitboard(GenerateNeighbors):
+    """ Neighbors of SenkuBitboardState, subclass it and set state_type to play in other boards """
+    state_type: Type[SenkuBitboardState] = SenkuBitboardState
+
+    @classmethod
+    def generate_neighbors(
+            cls,
+            actual_node: Node[SenkuBitboardState],
+            frontier: Container[Node[SenkuBitboardState]],
+            visited_states: Container[SenkuBitboardState]
+    ) -> List[Node[SenkuBitboardState]]:
+        neighbors = []
+        state_type = cls.state_type
+        pegs = actual_node.state.pegs
+        for move, (from_over, to, jump) in enumerate(state_type.board.jumps):
+            if pegs & from_over == from_over and not pegs & to:
+                neighbors.append(Node(state_type(pegs ^ jump), actual_node, move, actual_node.cost + 1))
         return neighbors
 
+    @classmethod
+    def iterate_neighbors(
+            cls,
+            actual_node: Node[SenkuBitboardState],
+            frontier: Container[Node[SenkuBitboardState]],
+            visited_states: Container[SenkuBitboardState]
+    ) -> Iterator[Node[SenkuBitboardState]]:
+        state_type = cls.state_type
+        pegs = actual_node.state.pegs
+        for move, (from_over, to, jump) in enumerate(state_type.board.jumps):
+            if pegs & from_over == from_over and not pegs & to:
+                yield Node(state_type(pegs ^ jump), actual_node, move, actual_node.cost + 1)
+
+    @classmethod
+    def generate_predecessors(
+            cls,
+            actual_node: Node[SenkuBitboardState],
+            frontier: Container[Node[SenkuBitboardState]],
+            visited_states: Container[SenkuBitboardState]
+    ) -> List[Node[SenkuBitboardState]]:
+        predecessors = []
+        state_type = cls.state_type
+        pegs = actual_node.state.pegs
+        # Undo the jump, the peg goes back from the to hole to the from hole and the jumped one reappears
+        for move, (from_over, to, jump) in enumerate(state_type.board.jumps):
+            if pegs & to and not pegs & from_over:
+                predecessors.append(Node(state_type(pegs ^ jump), actual_node, move, actual_node.cost + 1))
+        return predecessors
+
+    @classmethod
+    def describe_move(cls, move: int) -> str:
+        return cls.state_type.board.jump_descriptions[move]
+
+
+class GenerateNeighborsSenkuBatch(GenerateNeighborsSenkuBitboard, GenerateNeighborsBatch):
+    """ GenerateNeighborsSenkuBitboard for whole layers, the states are a uint64 array of pegs """
+    @classmethod
+    def to_array(cls, states: List[SenkuBitboardState]) -> np.ndarray:
+        return np.array([state.pegs for state in states], dtype=np.uint64)
+
+    @classmethod
+    def from_array(cls, states: np.ndarray) -> List[SenkuBitboardState]:
+        return [cls.state_type(int(pegs)) for pegs in states]
+
+    @classmethod
+    def expand(cls, states: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        neighbors, parents, moves = [states[:0]], [np.zeros(0, dtype=np.intp)], [np.zeros(0, dtype=np.int64)]
+        # One jump at a time, but for every board of the layer
+        for move, (from_over, to, jump) in enumerate(cls.state_type.board.jumps):
+            from_over = np.uint64(from_over)
+            legal = np.flatnonzero((states & from_over == from_over) & (states & np.uint64(to) == 0))
+            if len(legal):
+                neighbors.append(states[legal] ^ np.uint64(jump))
+                parents.append(legal)
+                moves.append(np.full(len(legal), move, dtype=np.int64))
+        return np.concatenate(neighbors), np.concatenate(parents), np.concatenate(moves)
+
+    @staticmethod
+    def heuristic_array(states: np.ndarray) -> np.ndarray:
+        # SenkuBitboardState.heuristic of every board
+        if hasattr(np, 'bitwise_count'):
+            amounts_pegs = np.bitwise_count(states)
+        else:
+            amounts_pegs = np.unpackbits(states.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+        return amounts_pegs.astype(np.int64) - 1
+
+
+class EuropeanSenkuBitboardState(SenkuBitboardState):
+    __slots__ = ()
+    board = EUROPEAN_BOARD
+
+
+class GenerateNeighborsEuropeanSenkuBitboard(GenerateNeighborsSenkuBitboard):
+    state_type = EuropeanSenkuBitboardState
+
+
+class TriangularSenkuBitboardState(SenkuBitboardState):
+    __slots__ = ()
+    board = TRIANGULAR_BOARD
+
+
+class GenerateNeighborsTriangularSenkuBitboard(GenerateNeighborsSenkuBitboard):
+    state_type = TriangularSenkuBitboardState
+
+
+class FrontierModeSenkuExternalBFS(FrontierModeExternalBFS):
+    # A state is only in one layer, see SenkuBitboardState
+    state_type = SenkuBitboardState
+    duplicate_layers = 0
+
+
+class SenkuPagodaRule(PruningRule):
+    """ Prune the states with less pagoda value than the goal
+
+    A pagoda function gives each hole a weight such that for every jump the weights of the from
+    and over holes add up to at least the one of the to hole, so the total weight of the pegs
+    never grows. The default weights are g^d, with g = (sqrt(5) - 1) / 2 and d the distance from
+    the target hole, the one of the last peg. Subclass it to set state_type, target or weights,
+    they are checked to be a pagoda function of the board the first time it is used
+    """
+    state_type: Type[SenkuBitboardState] = SenkuBitboardState
+    target: Tuple[int, int] = (3, 3)
+    weights: Dict[Tuple[int, int], float] = None
+
+    @classmethod
+    def _tables(cls) -> List[List[float]]:
+        """ For each byte of the pegs, the weight of its 256 values. Built once for each subclass """
+        if '_byte_tables' in cls.__dict__:
+            return cls._byte_tables
+        board = cls.state_type.board
+        weights = cls.weights
+        if weights is None:
+            ratio = (5 ** 0.5 - 1) / 2
+            weights = {(row, column): ratio ** (abs(row - cls.target[0]) + abs(column - cls.target[1]))
+                       for row, column in board.holes}
+        weights_bits = [weights[hole] for hole in board.holes]
+        for from_over, to, _ in board.jumps:
+            low_bit = from_over & -from_over
+            from_weight = weights_bits[low_bit.bit_length() - 1]
+            over_weight = weights_bits[from_over.bit_length() - 1]
+            if from_weight + over_weight < weights_bits[to.bit_length() - 1] - 1e-9:
+                raise ValueError('{} weights are not a pagoda function of its board'.format(cls.__name__))
+        cls._byte_tables = [
+            [sum(weights_bits[first_hole + offset] for offset in range(8)
+                 if byte >> offset & 1 and first_hole + offset < len(weights_bits)) for byte in range(256)]
+            for first_hole in range(0, len(weights_bits), 8)]
+        cls._goal_value = weights[cls.target]
+        return cls._byte_tables
+
+    @classmethod
+    def pagoda(cls, pegs: int) -> float:
+        value = 0
+        for table in cls._tables():
+            value += table[pegs & 0xFF]
+            pegs >>= 8
+        return value
+
+    @classmethod
+    def is_dead(cls, state: SenkuBitboardState) -> bool:
+        return cls.pagoda(state.pegs) < cls._goal_value - 1e-9
+
+    @classmethod
+    def order_neighbors(cls, neighbors: List[Node[SenkuBitboardState]]) -> List[Node[SenkuBitboardState]]:
+        """ Move ordering for Pruner, the neighbors with more pagoda value last so DFS explores
+        them first
+        """
+        return sorted(neighbors, key=lambda neighbor: cls.pagoda(neighbor.state.pegs))
+
+
+class SenkuDeadPegRule(PruningRule):
+    """ Prune the states with a peg that can never be jumped over nor jump, out of the target hole
+
+    The holes where a peg may be in the future are over-approximated by the closure of the pegs
+    under the jumps, ignoring that the to hole must be empty and that the pegs are removed. A
+    peg with no hole of the closure to jump over and no hole of the closure to be jumped from
+    stays forever, like the isolated pegs or the ones in a corner the others can not reach.
+    With target None the last peg can be in any hole, then a state is pruned with two of those
+    pegs. Subclass it to set state_type or target
+    """
+    state_type: Type[SenkuBitboardState] = SenkuBitboardState
+    target: Union[Tuple[int, int], None] = (3, 3)
+
+    @classmethod
+    def _masks(cls) -> List[int]:
+        """ For each hole, the holes a peg in it can jump over or be jumped from. Built once for
+        each subclass
+        """
+        if '_alive_masks' in cls.__dict__:
+            return cls._alive_masks
+        board = cls.state_type.board
+        alive_masks = [0] * len(board.holes)
+        for from_over, _, _ in board.jumps:
+            # The jumping peg needs a peg in the jumped hole and the other way around
+            low_bit = from_over & -from_over
+            high_bit = from_over ^ low_bit
+            alive_masks[low_bit.bit_length() - 1] |= high_bit
+            alive_masks[high_bit.bit_length() - 1] |= low_bit
+        cls._alive_masks = alive_masks
+        return alive_masks
+
+    @classmethod
+    def is_dead(cls, state: SenkuBitboardState) -> bool:
+        alive_masks = cls._masks()
+        jumps = cls.state_type.board.jumps
+        pegs = state.pegs
+        closure = pegs
+        grown = True
+        while grown:
+            grown = False
+            for from_over, to, _ in jumps:
+                if closure & from_over == from_over and not closure & to:
+                    closure |= to
+                    grown = True
+        target_bit = cls.state_type.board.bits[cls.target] if cls.target is not None else 0
+        if target_bit and not closure & target_bit:
+            return True
+        amount_stuck = 0
+        remaining = pegs
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            if not closure & alive_masks[bit.bit_length() - 1]:
+                if bit != target_bit:
+                    if target_bit or amount_stuck:
+                        return True
+                amount_stuck += 1
+        return False
+
+
+class SenkuEndgameRule(EndgameRule):
+    """ EndgameRule for a database of SenkuBitboardState built with a max_depth, subclass it and set
+    database
+    """
+    @classmethod
+    def is_covered(cls, state: SenkuBitboardState) -> bool:
+        # The heuristic is the length of every game to the end, see SenkuBitboardState
+        return cls.database.max_depth is None or state.heuristic() <= cls.database.max_depth
+
+
+def build_endgame_database(
+        path: str,
+        max_pegs: int,
+        state_type: Type[SenkuBitboardState] = SenkuBitboardState,
+        generate_neighbors: Type[GenerateNeighborsSenkuBitboard] = GenerateNeighborsSenkuBitboard,
+        target: Tuple[int, int] = (3, 3)
+) -> EndgameDatabase:
+    """ Database of the states with at most max_pegs pegs that can end with one peg in target """
+    goal_state = state_type(state_type.board.bits[target])
+    return EndgameDatabase.build(path, state_type, generate_neighbors, [goal_state], max_depth=max_pegs - 1)
+
+
+def single_peg_states(state_type: Type[SenkuBitboardState]) -> List[SenkuBitboardState]:
+    """ The states with one peg left, in any hole of the board """
+    return [state_type(bit) for bit in state_type.board.bits.values()]
+
+
+def is_single_peg(state: SenkuBitboardState) -> bool:
+    """ Goal predicate of one peg left in any hole, to use with GoalPredicate """
+    # Removing the lowest bit leaves the board empty
+    return state.pegs != 0 and state.pegs & (state.pegs - 1) == 0
+
 
 def main():
     initial_state = SenkuState(
@@ -93,7 +556,7 @@ def main():
             [' ', ' ', 'X', 'X', 'X', ' ', ' ']
         ])
     )
-    goal_states = [
+    goal_states = GoalSet([
         SenkuState(
             31,
             np.array([
@@ -106,7 +569,7 @@ def main():
                 [' ', ' ', '-', '-', '-', ' ', ' ']
             ])
         )
-    ]
+    ])
 
     debug_mode = DebugMode(
         show_amount_solutions=True,
@@ -0,0 +1,120 @@
+import random
+from typing import Container, List, Tuple, Iterator
+
+from SearchAlgorithm.Structures import State, Node
+from SearchAlgorithm.FrontierMode import FrontierModeAStar
+from SearchAlgorithm.VisitedMode import VisitedModeSet
+from SearchAlgorithm.GenerateNeighbors import GenerateNeighbors
+from SearchAlgorithm.SearchAlgorithm import SearchAlgorithmIterative
+
+# (row step, column step) of the blank for each move code
+MOVES = ((-1, 0), (1, 0), (0, -1), (0, 1))
+MOVE_NAMES = ('up', 'down', 'left', 'right')
+
+
+class SlidingPuzzleState(State):
+    """ Tiles of a size x size sliding puzzle (8-puzzle, 15-puzzle...) by rows, 0 is the blank """
+    __slots__ = ('tiles',)
+
+    def __init__(self, tiles: Tuple[int, ...]):
+        self.tiles = tiles
+
+    def __eq__(self, other):
+        return self.tiles == other.tiles
+
+    def key(self):
+        return self.tiles
+
+    def __hash__(self):
+        return hash(self.tiles)
+
+    def pack(self):
+        return bytes(self.tiles)
+
+    @classmethod
+    def unpack(cls, data):
+        return cls(tuple(data))
+
+    def heuristic(self):
+        # Sum of the manhattan distances of the tiles to their place in the solved puzzle
+        size = puzzle_size(self.tiles)
+        distance = 0
+        for position, tile in enumerate(self.tiles):
+            if tile != 0:
+                goal_row, goal_column = divmod(tile - 1, size)
+                distance += abs(position // size - goal_row) + abs(position % size - goal_column)
+        return distance
+
+
+class GenerateNeighborsSlidingPuzzle(GenerateNeighbors):
+    @staticmethod
+    def generate_neighbors(
+            actual_node: Node[SlidingPuzzleState],
+            frontier: Container[Node[SlidingPuzzleState]],
+            visited_states: Container[SlidingPuzzleState]
+    ) -> List[Node[SlidingPuzzleState]]:
+        return list(GenerateNeighborsSlidingPuzzle.iterate_neighbors(actual_node, frontier, visited_states))
+
+    @staticmethod
+    def iterate_neighbors(
+            actual_node: Node[SlidingPuzzleState],
+            frontier: Container[Node[SlidingPuzzleState]],
+            visited_states: Container[SlidingPuzzleState]
+    ) -> Iterator[Node[SlidingPuzzleState]]:
+        tiles = actual_node.state.tiles
+        size = puzzle_size(tiles)
+        blank = tiles.index(0)
+        row, column = divmod(blank, size)
+        for move, (row_step, column_step) in enumerate(MOVES):
+            if 0 <= row + row_step < size and 0 <= column + column_step < size:
+                new_blank = blank + row_step * size + column_step
+                new_tiles = list(tiles)
+                new_tiles[blank], new_tiles[new_blank] = new_tiles[new_blank], 0
+                yield Node(SlidingPuzzleState(tuple(new_tiles)), actual_node, move, actual_node.cost + 1)
+
+    @staticmethod
+    def generate_predecessors(
+            actual_node: Node[SlidingPuzzleState],
+            frontier: Container[Node[SlidingPuzzleState]],
+            visited_states: Container[SlidingPuzzleState]
+    ) -> List[Node[SlidingPuzzleState]]:
+        # Every move is undone by the opposite one, which is the other move of its pair in MOVES
+        neighbors = GenerateNeighborsSlidingPuzzle.iterate_neighbors(actual_node, frontier, visited_states)
+        return [Node(neighbor.state, actual_node, neighbor.move ^ 1, neighbor.cost) for neighbor in neighbors]
+
+    @staticmethod
+    def describe_move(move: int) -> str:
+        return MOVE_NAMES[move]
+
+
+def puzzle_size(tiles: Tuple[int, ...]) -> int:
+    return int(round(len(tiles) ** 0.5))
+
+
+def solved_state(size: int) -> SlidingPuzzleState:
+    return SlidingPuzzleState(tuple(range(1, size * size)) + (0,))
+
+
+def scrambled_state(size: int, amount_moves: int, seed: int = 0) -> SlidingPuzzleState:
+    """ State reached moving the blank at random amount_moves times from the solved puzzle """
+    random_generator = random.Random(seed)
+    node = Node(solved_state(size))
+    for _ in range(amount_moves):
+        node = random_generator.choice(GenerateNeighborsSlidingPuzzle.generate_neighbors(node, [], []))
+    return node.state
+
+
+def main():
+    solution = SearchAlgorithmIterative.find_solution(
+        frontier_mode=FrontierModeAStar,
+        visited_mode=VisitedModeSet,
+        generate_neighbors=GenerateNeighborsSlidingPuzzle,
+        frontier_remove_repeated=False,
+        initial_state=scrambled_state(3, 60),
+        goal_states=[solved_state(3)]
+    )
+    print(solution)
+
+
+if __name__ == '__main__':
+    main()
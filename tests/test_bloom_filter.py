@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+
+from SearchAlgorithm.BloomFilter import BloomFilter
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_false_positive_rate(self):
+        bloom_filter = BloomFilter(10000, 0.01)
+        for key in range(10000):
+            bloom_filter.add(key)
+        self.assertTrue(all(key in bloom_filter for key in range(10000)))
+        amount_false_positives = sum(key in bloom_filter for key in range(10000, 110000))
+        self.assertLess(amount_false_positives / 100000, 0.015)
+        self.assertAlmostEqual(0.01, bloom_filter.expected_false_positive_rate(), delta=0.003)
+
+    def test_resume_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'visited')
+            with BloomFilter(1000, 0.01, path=path) as bloom_filter:
+                for key in range(0, 2000, 2):
+                    bloom_filter.add(key)
+                bits_set = bloom_filter.bits_set
+            with BloomFilter(1000, 0.01, path=path, resume=True) as bloom_filter:
+                self.assertEqual(bits_set, bloom_filter.bits_set)
+                self.assertTrue(all(key in bloom_filter for key in range(0, 2000, 2)))
+            # Without resume, or with another size, the file starts zeroed
+            for size_bytes, resume in ((None, False), (4096, True)):
+                with self.subTest(size_bytes=size_bytes, resume=resume):
+                    with BloomFilter(1000, 0.01, size_bytes, path, resume) as bloom_filter:
+                        self.assertEqual(0, bloom_filter.bits_set)
+                        self.assertFalse(any(key in bloom_filter for key in range(0, 2000, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
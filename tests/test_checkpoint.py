@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from Senku import SenkuBitboardState
+from SearchAlgorithm.Structures import Node
+from SearchAlgorithm.Checkpoint import Checkpoint, is_checkpoint, save_checkpoint, load_checkpoint
+
+
+def frontier_nodes():
+    """ Two frontier nodes that share their ancestors """
+    root = Node(SenkuBitboardState(0b111))
+    middle = Node(SenkuBitboardState(0b100), root, 3, 1)
+    return [Node(SenkuBitboardState(0b1000), middle, 5, 2), Node(SenkuBitboardState(0b10000), middle, 7, 2)]
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'save')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        save_checkpoint(self.path, Checkpoint(3, 10, 4, 1.5, frontier_nodes()))
+        self.assertTrue(is_checkpoint(self.path))
+        checkpoint = load_checkpoint(self.path, SenkuBitboardState)
+        self.assertEqual((3, 10, 4, 1.5), checkpoint[:4])
+        self.assertEqual([0b1000, 0b10000], [node.state.pegs for node in checkpoint.frontier_nodes])
+        self.assertEqual([[3, 5], [3, 7]], [node.path for node in checkpoint.frontier_nodes])
+        self.assertEqual([2, 2], [node.cost for node in checkpoint.frontier_nodes])
+        # The shared ancestors are loaded once
+        self.assertIs(checkpoint.frontier_nodes[0].parent, checkpoint.frontier_nodes[1].parent)
+        self.assertIsNone(checkpoint.frontier_nodes[0].parent.parent.move)
+
+    def test_failed_save_keeps_the_previous_checkpoint(self):
+        save_checkpoint(self.path, Checkpoint(1, 2, 3, 0.5, frontier_nodes()))
+        with mock.patch('SearchAlgorithm.Checkpoint.os.fsync', side_effect=OSError):
+            with self.assertRaises(OSError):
+                save_checkpoint(self.path, Checkpoint(4, 5, 6, 1.0, []))
+        self.assertEqual((1, 2, 3, 0.5), load_checkpoint(self.path, SenkuBitboardState)[:4])
+        save_checkpoint(self.path, Checkpoint(4, 5, 6, 1.0, []))
+        self.assertEqual((4, 5, 6, 1.0), load_checkpoint(self.path, SenkuBitboardState)[:4])
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_truncated_file(self):
+        save_checkpoint(self.path, Checkpoint(1, 2, 3, 0.5, frontier_nodes()))
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        for length in (2, 20, len(data) // 2, len(data) - 1):
+            with self.subTest(length=length):
+                with open(self.path, 'wb') as file:
+                    file.write(data[:length])
+                with self.assertRaises(ValueError):
+                    load_checkpoint(self.path, SenkuBitboardState)
+
+    def test_bad_magic(self):
+        save_checkpoint(self.path, Checkpoint(1, 2, 3, 0.5, frontier_nodes()))
+        with open(self.path, 'r+b') as file:
+            file.write(b'XXXX')
+        self.assertFalse(is_checkpoint(self.path))
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path, SenkuBitboardState)
+
+    def test_moves_must_be_ints(self):
+        node = Node(SenkuBitboardState(0b10), Node(SenkuBitboardState(0b1)), 'up', 1)
+        with self.assertRaises(TypeError):
+            save_checkpoint(self.path, Checkpoint(0, 0, 0, 0.0, [node]))
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
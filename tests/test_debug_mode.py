@@ -0,0 +1,41 @@
+import collections
+import copyreg
+import os
+import pickle
+import tempfile
+import unittest
+
+from Maze import Maze, MazeState
+from SearchAlgorithm.Structures import Node
+from SearchAlgorithm.FrontierMode import FrontierModeDFS
+from SearchAlgorithm.DebugMode import DebugMode
+
+
+class BaselineNode:
+    """ Pickled like a Node of the versions without checkpoints, with its attributes in __dict__ """
+    def __init__(self, state, path, cost):
+        self.state = state
+        self.path = path
+        self.cost = cost
+
+    def __reduce__(self):
+        return copyreg._reconstructor, (Node, object, None), \
+            {'state': self.state, 'path': self.path, 'cost': self.cost}
+
+
+class TestDebugMode(unittest.TestCase):
+    def test_baseline_save_is_rejected(self):
+        maze = Maze(3)
+        frontier = collections.deque([BaselineNode(MazeState(maze, (1, 3)), ['right'], 1)])
+        with tempfile.TemporaryDirectory() as directory:
+            save_file_path = os.path.join(directory, 'save')
+            with open(save_file_path, 'wb') as file:
+                pickle.dump((0, 5, frontier, 2, 1.5), file)
+            debug_mode = DebugMode(False, False, False, False, False, False, 0, save_file_path=save_file_path,
+                                   read_exit_key=False)
+            with self.assertRaisesRegex(ValueError, 'Unsupported save format'):
+                debug_mode.initialization(MazeState(maze, maze.start), FrontierModeDFS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+from Senku import TriangularSenkuBitboardState, GenerateNeighborsTriangularSenkuBitboard, SenkuEndgameRule
+from SearchAlgorithm.Structures import Node
+from SearchAlgorithm.FrontierMode import FrontierModeDFS
+from SearchAlgorithm.VisitedMode import VisitedModeNone
+from SearchAlgorithm.EndgameDatabase import EndgameDatabase, EndgameRule
+
+BOARD = TriangularSenkuBitboardState.board
+GOAL_STATE = TriangularSenkuBitboardState(BOARD.bits[(0, 0)])
+
+
+def backward_distances():
+    """ Distance to the goal state of every state that can reach it, by a breadth first search """
+    distances = {GOAL_STATE.pegs: 0}
+    layer = [Node(GOAL_STATE)]
+    while layer:
+        next_layer = []
+        for node in layer:
+            for predecessor in GenerateNeighborsTriangularSenkuBitboard.generate_predecessors(node, (), ()):
+                if predecessor.state.pegs not in distances:
+                    distances[predecessor.state.pegs] = predecessor.cost
+                    next_layer.append(predecessor)
+        layer = next_layer
+    return distances
+
+
+class TestEndgameDatabase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.distances = backward_distances()
+        cls.all_states = [TriangularSenkuBitboardState(pegs) for pegs in range(1, 1 << len(BOARD.holes))]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def build(self, max_depth=None):
+        database = EndgameDatabase.build(
+            os.path.join(self.directory.name, 'endgame'), TriangularSenkuBitboardState,
+            GenerateNeighborsTriangularSenkuBitboard, [GOAL_STATE], max_depth, run_size=1000,
+            directory=self.directory.name)
+        self.addCleanup(database.close)
+        return database
+
+    def test_distance(self):
+        database = self.build()
+        self.assertEqual(len(self.distances), len(database))
+        for state in self.all_states:
+            self.assertEqual(self.distances.get(state.pegs), database.distance(state))
+
+    def test_distance_with_max_depth(self):
+        database = self.build(max_depth=4)
+        for state in self.all_states:
+            distance = self.distances.get(state.pegs)
+            if distance is not None and distance > 4:
+                distance = None
+            self.assertEqual(distance, database.distance(state))
+
+    def test_rule_only_prunes_unsolvable_states(self):
+        for max_depth, rule_type in ((None, EndgameRule), (4, SenkuEndgameRule)):
+            with self.subTest(max_depth=max_depth):
+                rule = type('Rule', (rule_type,), {'database': self.build(max_depth)})
+                dead_states = [state for state in self.all_states if rule.is_dead(state)]
+                self.assertTrue(dead_states)
+                for state in dead_states:
+                    self.assertNotIn(state.pegs, self.distances)
+                if max_depth is None:
+                    self.assertEqual(len(self.all_states) - len(self.distances), len(dead_states))
+
+    def test_find_solution(self):
+        database = self.build(max_depth=4)
+        initial_state = TriangularSenkuBitboardState(((1 << len(BOARD.holes)) - 1) ^ BOARD.bits[(0, 0)])
+        solution = database.find_solution(
+            FrontierModeDFS, VisitedModeNone, GenerateNeighborsTriangularSenkuBitboard, False, initial_state)
+        self.assertTrue(solution.has_solution)
+        self.assertEqual(self.distances[initial_state.pegs], len(solution.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from Senku import SenkuBitboardState, FrontierModeSenkuExternalBFS
+from SearchAlgorithm.ExternalFrontier import ExternalFrontier, _unique, _difference
+from SearchAlgorithm.DebugMode import DebugMode
+
+
+class ShortPackedState(SenkuBitboardState):
+    """ SenkuBitboardState packed in 2 bytes, so the order of the records is the order of the pegs """
+    __slots__ = ()
+
+    def pack(self):
+        return self.pegs.to_bytes(2, 'big')
+
+
+class TestExternalFrontier(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_frontier(self, duplicate_layers=None):
+        return ExternalFrontier(ShortPackedState, 2, duplicate_layers, self.directory.name)
+
+    @staticmethod
+    def pop_layer(frontier):
+        """ Pegs of the nodes of the next layer, and their depth """
+        nodes = [frontier.pop()]
+        while frontier.layer_remaining:
+            nodes.append(frontier.pop())
+        return [node.state.pegs for node in nodes], nodes[0].cost
+
+    def test_unique_and_difference(self):
+        self.assertEqual([b'a', b'b', b'c'], list(_unique([b'a', b'a', b'b', b'c', b'c'])))
+        self.assertEqual([b'a', b'c', b'e'],
+                         list(_difference([b'a', b'b', b'c', b'd', b'e'], [b'b', b'd', b'f'])))
+        self.assertEqual([b'a'], list(_difference([b'a'], [])))
+
+    def test_runs_are_merged_sorted_and_unique(self):
+        frontier = self.create_frontier()
+        for pegs in (9, 3, 7, 3, 1, 9, 5, 1):
+            frontier.add(ShortPackedState(pegs))
+        # run_size 2, so every pair is a run and the duplicates are in different runs
+        self.assertEqual(4, len(frontier.run_paths))
+        self.assertEqual(([1, 3, 5, 7, 9], 0), self.pop_layer(frontier))
+        self.assertEqual(0, len(frontier))
+        # The runs are removed once merged
+        self.assertEqual(['layer-0'], os.listdir(frontier.path))
+
+    def test_earlier_layers_are_removed(self):
+        for duplicate_layers, third_layer in ((None, [4]), (1, [1, 4])):
+            with self.subTest(duplicate_layers=duplicate_layers):
+                frontier = self.create_frontier(duplicate_layers)
+                frontier.add(ShortPackedState(1))
+                self.assertEqual(([1], 0), self.pop_layer(frontier))
+                for pegs in (2, 1, 3):
+                    frontier.add(ShortPackedState(pegs))
+                self.assertEqual(([2, 3], 1), self.pop_layer(frontier))
+                # The state of the first layer is only compared with it if it is kept
+                for pegs in (4, 1, 2, 3):
+                    frontier.add(ShortPackedState(pegs))
+                self.assertEqual((third_layer, 2), self.pop_layer(frontier))
+
+    def test_only_repeated_states_is_empty(self):
+        frontier = self.create_frontier()
+        frontier.add(ShortPackedState(1))
+        self.pop_layer(frontier)
+        frontier.add(ShortPackedState(1))
+        self.assertEqual(0, len(frontier))
+        with self.assertRaises(IndexError):
+            frontier.pop()
+
+    def test_packed_states_of_different_length(self):
+        frontier = self.create_frontier()
+        frontier.add(ShortPackedState(1))
+        with self.assertRaises(ValueError):
+            frontier.add(SenkuBitboardState(1))
+
+    def test_can_not_be_saved(self):
+        debug_mode = DebugMode(False, False, False, False, False, False, 0,
+                               save_file_path=os.path.join(self.directory.name, 'save'), read_exit_key=False)
+        with self.assertRaises(ValueError):
+            debug_mode.initialization(SenkuBitboardState(1), FrontierModeSenkuExternalBFS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import itertools
+import unittest
+from typing import Container, List, Iterator
+
+from SearchAlgorithm.Structures import State, Node
+from SearchAlgorithm.FrontierMode import FrontierModeUniformCost, FrontierModeAStar
+from SearchAlgorithm.VisitedMode import VisitedModeNone, VisitedModeSet
+from SearchAlgorithm.GenerateNeighbors import GenerateNeighbors
+from SearchAlgorithm.SearchAlgorithm import SearchAlgorithmIterative
+from SearchAlgorithm.SearchAlgorithmFused import SearchAlgorithmFused
+
+# The direct edge to B is more expensive than the path through A
+EDGES = {'S': (('A', 1), ('B', 5)), 'A': (('B', 1),), 'B': (('G', 1),), 'G': ()}
+# Consistent, it never overestimates the cost to G
+HEURISTICS = {'S': 3, 'A': 2, 'B': 1, 'G': 0}
+
+
+class GraphState(State):
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __eq__(self, other):
+        return self.name == other.name
+
+    def key(self):
+        return self.name
+
+    def heuristic(self):
+        return HEURISTICS[self.name]
+
+
+class GenerateNeighborsGraph(GenerateNeighbors):
+    @staticmethod
+    def generate_neighbors(
+            actual_node: Node[GraphState],
+            frontier: Container[Node[GraphState]],
+            visited_states: Container[GraphState]
+    ) -> List[Node[GraphState]]:
+        return list(GenerateNeighborsGraph.iterate_neighbors(actual_node, frontier, visited_states))
+
+    @staticmethod
+    def iterate_neighbors(
+            actual_node: Node[GraphState],
+            frontier: Container[Node[GraphState]],
+            visited_states: Container[GraphState]
+    ) -> Iterator[Node[GraphState]]:
+        for name, cost in EDGES[actual_node.state.name]:
+            yield Node(GraphState(name), actual_node, name, actual_node.cost + cost)
+
+    @staticmethod
+    def describe_move(move: str) -> str:
+        return move
+
+
+class TestFrontierModePriority(unittest.TestCase):
+    def test_cheaper_path_to_a_state_in_the_frontier(self):
+        search_algorithms = (SearchAlgorithmIterative, SearchAlgorithmFused)
+        frontier_modes = (FrontierModeUniformCost, FrontierModeAStar)
+        repeated_modes = ((VisitedModeNone, False), (VisitedModeSet, True))
+        for search_algorithm, frontier_mode, (visited_mode, frontier_remove_repeated) in \
+                itertools.product(search_algorithms, frontier_modes, repeated_modes):
+            with self.subTest(search_algorithm=search_algorithm.__name__,
+                              frontier_mode=frontier_mode.__name__, visited_mode=visited_mode.__name__):
+                solution = search_algorithm.find_solution(
+                    frontier_mode, visited_mode, GenerateNeighborsGraph, frontier_remove_repeated,
+                    GraphState('S'), [GraphState('G')])
+                # The path is returned from the last move
+                self.assertEqual(['G', 'B', 'A'], solution.path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from Maze import Maze, MazeState, GenerateNeighborsMaze, MOVES, MOVE_NAMES
+from SearchAlgorithm.FrontierMode import FrontierModeDFSIndexed
+from SearchAlgorithm.VisitedMode import VisitedModeSet
+from SearchAlgorithm.SearchAlgorithm import SearchAlgorithmIterative
+from SearchAlgorithm.SearchAlgorithmParallel import SearchAlgorithmParallel
+
+
+class TestSearchAlgorithmParallel(unittest.TestCase):
+    def test_deep_paths(self):
+        # The paths of a DFS in a big maze are longer than the recursion limit
+        maze = Maze(60)
+        arguments = (FrontierModeDFSIndexed, VisitedModeSet, GenerateNeighborsMaze, True,
+                     MazeState(maze, maze.start), [MazeState(maze, maze.goal)])
+        solution = SearchAlgorithmParallel.find_solution(*arguments, workers=2, node_budget=10000)
+        self.assertTrue(solution.has_solution)
+        # The tasks do not share their visited states, so the path may step back past its root
+        # and be longer than the one of the iterative search, but it must cross the maze
+        iterative_solution = SearchAlgorithmIterative.find_solution(*arguments)
+        self.assertGreaterEqual(len(solution.path), len(iterative_solution.path))
+        row, column = maze.start
+        # The solution has the last move first
+        for move_name in reversed(solution.path):
+            row_step, column_step = MOVES[MOVE_NAMES.index(move_name)]
+            row, column = row + row_step, column + column_step
+            self.assertTrue(maze.open_cells[row][column])
+        self.assertEqual(maze.goal, (row, column))
+
+
+if __name__ == '__main__':
+    unittest.main()